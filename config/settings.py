@@ -9,7 +9,8 @@ class Config:
     
     # Intercom
     INTERCOM_API_TOKEN = os.getenv("INTERCOM_API_TOKEN")
-    INTERCOM_BASE_URL = os.getenv("INTERCOM_BASE_URL")
+    INTERCOM_BASE_URL = os.getenv("INTERCOM_BASE_URL", "https://api.intercom.io")
+    INTERCOM_PAGE_SIZE = int(os.getenv("INTERCOM_PAGE_SIZE", "50"))  # Artigos por página (máx. da API: 150)
     
     # MongoDB
     MONGODB_CONNECTION_STRING = os.getenv("MONGODB_CONNECTION_STRING")
@@ -24,9 +25,42 @@ class Config:
     RAG_CONTEXTUAL_ENRICHER_MODEL = os.getenv("RAG_CONTEXTUAL_ENRICHER_MODEL")
     RAG_CHUNKER_MODEL = os.getenv("RAG_CHUNKER_MODEL")
     RAG_CATEGORIZER_MODEL = os.getenv("RAG_CATEGORIZER_MODEL")
+    # Categorização + enriquecimento numa única chamada (padrão: modelo do enricher)
+    RAG_ANALYZER_MODEL = os.getenv("RAG_ANALYZER_MODEL", os.getenv("RAG_CONTEXTUAL_ENRICHER_MODEL"))
     ## Configs
-    MAX_CHUNK_SIZE = os.getenv("MAX_CHUNK_SIZE")
-    EMBEDDING_DIMENSIONS = os.getenv("EMBEDDING_DIMENSIONS")
+    MAX_CHUNK_SIZE = int(os.getenv("MAX_CHUNK_SIZE", "2000"))
+    # Artigos até este tamanho (chars) viram um único chunk, sem chamada ao LLM (0 desativa)
+    SMALL_ARTICLE_THRESHOLD = int(os.getenv("SMALL_ARTICLE_THRESHOLD", os.getenv("MAX_CHUNK_SIZE", "2000")))
+    # Artigos até este tamanho (chars) são categorizados e enriquecidos numa única chamada (0 desativa)
+    ARTICLE_ANALYZER_MAX_CHARS = int(os.getenv("ARTICLE_ANALYZER_MAX_CHARS", "60000"))
+    # Conversor HTML → Markdown: "html2text" (padrão) ou "html2text_rs" (Rust, requer html2text-rs)
+    HTML_TO_MARKDOWN = os.getenv("HTML_TO_MARKDOWN", "html2text").lower()
+    EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "1536"))
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))  # Embeddings mantidos em memória (0 desativa)
+    ## Concurrency
+    ARTICLE_WORKERS = int(os.getenv("ARTICLE_WORKERS", "8"))
+    INTERCOM_PAGE_WORKERS = int(os.getenv("INTERCOM_PAGE_WORKERS", "8"))  # Páginas da Intercom buscadas em paralelo
+    IMAGE_DOWNLOAD_CONCURRENCY = int(os.getenv("IMAGE_DOWNLOAD_CONCURRENCY", "16"))  # Downloads de imagens simultâneos
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "5"))  # Retentativas HTTP (Intercom, Kyte, imagens)
+    OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "6"))
+    MAX_CONSECUTIVE_FAILURES = int(os.getenv("MAX_CONSECUTIVE_FAILURES", "5"))  # Artigos seguidos com erro antes de abortar (0 desativa)
+    IMAGE_PROCESS_WORKERS = int(os.getenv("IMAGE_PROCESS_WORKERS", "0"))  # Processos para preparar imagens (0 = na própria thread)
+    ## Cache (vazio desativa)
+    PIPELINE_CACHE_PATH = os.getenv("PIPELINE_CACHE_PATH", "")
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")  # Respostas de texto do LLM por prompt (persistente)
+    LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "10000"))  # Respostas mantidas em memória na execução (0 desativa)
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "")  # Embeddings por texto/modelo/dimensões (persistente)
+    IMAGE_CACHE_PATH = os.getenv("IMAGE_CACHE_PATH", "")  # Descrições de imagens por URL/conteúdo
+    IMAGE_CACHE_TTL_DAYS = int(os.getenv("IMAGE_CACHE_TTL_DAYS", "30"))
+    HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "")  # Respostas GET da Intercom/Kyte (requer requests-cache)
+    HTTP_CACHE_EXPIRE_SECONDS = int(os.getenv("HTTP_CACHE_EXPIRE_SECONDS", "3600"))
+    ## MongoDB
+    MONGODB_FLUSH_SIZE = int(os.getenv("MONGODB_FLUSH_SIZE", "500"))
+    # Compressão do protocolo, ex.: "zstd,snappy,zlib" (zstd/snappy exigem zstandard/python-snappy)
+    MONGODB_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS", "")
+    # Armazenamento dos embeddings: "array" (lista de doubles), "float32" ou "int8" (BSON Binary vector)
+    MONGODB_VECTOR_DTYPE = os.getenv("MONGODB_VECTOR_DTYPE", "array").lower()
     
     @classmethod
     def validate(cls):
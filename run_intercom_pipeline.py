@@ -1,5 +1,9 @@
 import sys
 import os
+import logging
+from collections import Counter
+from collections.abc import Set as AbstractSet
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 
 # Adiciona o diretório raiz do projeto ao Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -10,224 +14,261 @@ from src.api.intercom_client import IntercomClient
 from src.processing.text_processor import TextProcessor
 from src.processing.chunker import LLMChunker
 from src.processing.contextual_enricher import ContextualEnricher
+from src.processing.article_analyzer import ArticleAnalyzer
 from src.processing.categorizer import ArticleCategorizer
+from src.processing.image_processor import shutdown_process_pool
 from src.utils.embeddings import EmbeddingGenerator
 from src.utils.text_cleaner import TextCleaner
+from src.utils.pipeline_cache import ImageDescriptionCache, PipelineCache
 from src.mongodb.mongodb_client import MongoDBClient
 
+logger = logging.getLogger(__name__)
+
+# ID dos artigos que podem ser descartados (se houver); frozenset imutável,
+# compartilhado com segurança entre as threads de processamento
+EXCLUDED_ARTICLE_IDS: frozenset[str] = frozenset({"7861154"})  # or frozenset()
+
+# IDs que devem ter todos os idiomas (PT, EN, ES)
+MULTILINGUAL_ARTICLE_IDS: frozenset[str] = frozenset({
+    "7861149", "7915496", "8411647", "8887223", "7915619",
+    "7861109", "10008263", "7885145", "7992438", "7914908"
+})
+
 
 def list_all_collections(intercom_client: IntercomClient) -> dict:
     """Lista todas as coleções disponíveis na Intercom (para achar a de RAG)."""
     try:
         collections = intercom_client.list_collections()
-        print("\n📚 Coleções disponíveis na Intercom:")
-        print("-" * 50)
+        logger.info("\n📚 Coleções disponíveis na Intercom:")
+        logger.info("-" * 50)
         if collections and "data" in collections:
             for c in collections["data"]:
-                print(f"ID: {c.get('id')}")
-                print(f"Nome: {c.get('name', '—')}")
-                print(f"Descrição: {c.get('description', '—')}")
-                print("-" * 30)
+                logger.info("ID: %s", c.get('id'))
+                logger.info("Nome: %s", c.get('name', '—'))
+                logger.info("Descrição: %s", c.get('description', '—'))
+                logger.info("-" * 30)
         else:
-            print("Nenhuma coleção encontrada.")
+            logger.info("Nenhuma coleção encontrada.")
         return collections
     except Exception as e:
-        print(f"❌ Erro ao listar coleções: {e}")
+        logger.error("❌ Erro ao listar coleções: %s", e)
         return {}
 
 
-def is_rag_eligible_article(article: dict, rag_collection_id: str = None, excluded_article_ids: list = None) -> bool:
-    """Determina se um artigo é elegível para o RAG baseado na coleção e exclusões."""
+def eligible_translations(article: dict, rag_collection_id: str = None, excluded_article_ids: AbstractSet[str] = frozenset()) -> list | None:
+    """
+    Determina se um artigo é elegível para o RAG baseado na coleção e exclusões.
+
+    Returns:
+        list | None: Pares (idioma, conteúdo) com corpo e estado válidos, ou None
+        se o artigo não for elegível.
+    """
     article_id = str(article.get("id", ""))
 
-    if excluded_article_ids and article_id in excluded_article_ids:
-        return False
+    if article_id in excluded_article_ids:
+        return None
 
     if rag_collection_id:
         parent_ids = article.get("parent_ids", [])
-        if rag_collection_id not in [str(pid) for pid in parent_ids]:
-            return False
-
-    translated_content = article.get("translated_content", {})
-    if not translated_content:
-        return False
-
-    for _, content in translated_content.items():
-        if isinstance(content, dict) and content.get("body"):
-            state = content.get("state", "")
-            if state == "published" or (state == "draft" and rag_collection_id):
-                return True
+        if rag_collection_id not in map(str, parent_ids):
+            return None
+
+    # Rascunhos só entram quando o artigo vem da coleção RAG
+    eligible_states = ("published", "draft") if rag_collection_id else ("published",)
+    translations = [
+        (lang, content)
+        for lang, content in (article.get("translated_content") or {}).items()
+        if isinstance(content, dict) and content.get("body") and content.get("state") in eligible_states
+    ]
 
-    return False
+    return translations or None
 
 
-def get_allowed_languages(article_id: str, multilingual_article_ids: list) -> list:
+def get_allowed_languages(article_id: str, multilingual_article_ids: AbstractSet[str]) -> list:
     """
     Determina quais idiomas processar baseado no ID do artigo.
     - Para IDs específicos: processa PT, EN, ES
     - Para demais artigos: apenas PT-BR
     """
-    if str(article_id) in multilingual_article_ids:
+    if article_id in multilingual_article_ids:
         return ["pt", "pt-BR", "en", "es"]  # Todos os idiomas para artigos específicos
     else:
         return ["pt", "pt-BR"]  # Apenas português para os demais
 
 
 def process_single_article(article: dict, components: dict, rag_collection_id: str = None, 
-                         excluded_article_ids: list = None, multilingual_article_ids: list = None) -> list:
+                         excluded_article_ids: AbstractSet[str] = frozenset(), multilingual_article_ids: AbstractSet[str] = frozenset()) -> list:
     """
     Processa um único artigo da Intercom seguindo as melhores práticas:
     HTML → Markdown → Categorização → Chunking → Contextual Enrichment → Limpeza Condicional → Embeddings
     
+    Os embeddings de todos os chunks do artigo são gerados em lote, com uma
+    única chamada à API.
+    
     Agora com filtro de idiomas baseado na lista de artigos multilíngues.
     """
-    article_id = article.get("id")
+    article_id = str(article.get("id", ""))  # convertido uma única vez
     documents_for_db = []
+    pending = []  # (documento, texto para embedding)
 
-    if not is_rag_eligible_article(article, rag_collection_id, excluded_article_ids):
-        if excluded_article_ids and str(article_id) in excluded_article_ids:
-            print(f" -> Artigo {article_id} pulado: está na lista de exclusões.")
+    translations = eligible_translations(article, rag_collection_id, excluded_article_ids)
+    if not translations:
+        if article_id in excluded_article_ids:
+            logger.info(" -> Artigo %s pulado: está na lista de exclusões.", article_id)
         else:
-            print(f" -> Artigo {article_id} pulado: não está na coleção RAG ou não tem conteúdo válido.")
+            logger.info(" -> Artigo %s pulado: não está na coleção RAG ou não tem conteúdo válido.", article_id)
         return documents_for_db
 
 
+    is_multilingual_article = article_id in multilingual_article_ids
+
     # Se for coleção RAG, processa todos os idiomas disponíveis
     if rag_collection_id:
         allowed_languages = list(article.get("translated_content", {}).keys())
-        print(f"📋 Artigo {article_id} (coleção RAG) - Todos idiomas permitidos: {allowed_languages}")
+        logger.info("📋 Artigo %s (coleção RAG) - Todos idiomas permitidos: %s", article_id, allowed_languages)
     else:
-        allowed_languages = get_allowed_languages(article_id, multilingual_article_ids or [])
-        print(f"📋 Artigo {article_id} - Idiomas permitidos: {allowed_languages}")
+        allowed_languages = get_allowed_languages(article_id, multilingual_article_ids)
+        logger.info("📋 Artigo %s - Idiomas permitidos: %s", article_id, allowed_languages)
 
-    for lang, content in article.get("translated_content", {}).items():
+    for lang, content in translations:
         # Se for coleção RAG, não filtra idiomas
         if not rag_collection_id and lang not in allowed_languages:
-            print(f" -> Idioma {lang} pulado para artigo {article_id} (não está na lista permitida)")
-            continue
-
-        if not (isinstance(content, dict) and content.get("body")):
+            logger.info(" -> Idioma %s pulado para artigo %s (não está na lista permitida)", lang, article_id)
             continue
 
         state = content.get("state", "")
-        if not (state == "published" or (state == "draft" and rag_collection_id)):
-            continue
-
-        print(f"\n📄 Processando Artigo ID: {article_id}, Idioma: {lang}, Estado: {state}")
+        logger.info("\n📄 Processando Artigo ID: %s, Idioma: %s, Estado: %s", article_id, lang, state)
 
-        # ✅ ETAPA 1: HTML → Markdown formatado (preserva estrutura semântica)
         html_body = content["body"]
-        markdown_text = components["text_processor"].process_html_body(html_body)
-        if not markdown_text:
-            print(" -> Artigo pulado: sem texto após parsing HTML.")
-            continue
+        title = content.get("title", f"Artigo {article_id}")
 
-        print(f"📝 Markdown gerado: {len(markdown_text)} chars")
+        # Conteúdo inalterado desde a última execução reaproveita as etapas 1-4
+        cache = components.get("pipeline_cache")
+        cache_key = cache.make_key(lang, html_body) if cache else None
+        cached = cache.get(cache_key, article.get("updated_at")) if cache else None
 
-        # ✅ ETAPA 2: Categorização (usa markdown formatado)
-        title = content.get("title", f"Artigo {article_id}")
-        category = components["categorizer"].categorize_article(markdown_text, title)
-        print(f" -> Categoria identificada: {category}")
+        if cached:
+            markdown_text = cached["markdown_text"]
+            category = cached["category"]
+            enriched_chunks = cached["enriched_chunks"]
+            logger.info(" -> Conteúdo inalterado: reutilizando %s chunks do cache (categoria: %s)", len(enriched_chunks), category)
+        else:
+            # ✅ ETAPA 1: HTML → Markdown formatado (preserva estrutura semântica)
+            markdown_text = components["text_processor"].process_html_body(html_body)
+            if not markdown_text:
+                logger.info(" -> Artigo pulado: sem texto após parsing HTML.")
+                continue
+
+            logger.info("📝 Markdown gerado: %s chars", len(markdown_text))
+
+            # ✅ ETAPA 2: Chunking semântico (usa markdown formatado)
+            logger.info(" -> Iniciando chunking semântico...")
+            chunks = components["chunker"].chunk_text(markdown_text)
+            logger.info(" -> Gerados %s chunks semânticos", len(chunks))
 
-        # ✅ ETAPA 3: Chunking semântico (usa markdown formatado)
-        print(" -> Iniciando chunking semântico...")
-        chunks = components["chunker"].chunk_text(markdown_text)
-        print(f" -> Gerados {len(chunks)} chunks semânticos")
+            # ✅ ETAPAS 3 e 4: Categorização + Contextual Enrichment (usa markdown formatado)
+            # Uma única chamada ao LLM por artigo; documentos muito longos ou
+            # respostas inválidas seguem pelas etapas separadas
+            analyzer = components.get("analyzer")
+            analysis = analyzer.analyze(markdown_text, title, chunks, lang) if analyzer else None
+            if analysis:
+                category, enriched_chunks = analysis
+            else:
+                category = components["categorizer"].categorize_article(markdown_text, title)
+                enriched_chunks = components["enricher"].enrich_chunks(chunks, markdown_text, language=lang)
+            logger.info(" -> Categoria identificada: %s", category)
+            logger.info(" -> Enriquecidos %s chunks com contexto", len(enriched_chunks))
 
-        # ✅ ETAPA 4: Contextual Enrichment (usa markdown formatado)
-        print(" -> Iniciando enriquecimento contextual...")
-        enriched_chunks = components["enricher"].enrich_chunks(chunks, markdown_text, language=lang)
-        print(f" -> Enriquecidos {len(enriched_chunks)} chunks com contexto")
+            if cache:
+                cache.set(cache_key, article.get("updated_at"), markdown_text, category, enriched_chunks)
 
-        # ✅ ETAPA 5: Limpeza condicional + Embeddings (APENAS agora limpa para vetor)
+        # ✅ ETAPA 5: Limpeza condicional (APENAS agora limpa para vetor)
         text_cleaner = components["text_cleaner"]
+        # Embedding com título + conteúdo limpo; o título é o mesmo para todos os chunks
+        title_prefix = title + "\n\n"
+        # Metadados comuns a todos os chunks desta tradução, montados uma única vez
+        translation_meta = {
+            "source_type": "intercom_help_center_article",
+            "article_id": article_id,
+            "intercom_url": content.get("url", ""),
+            "intercomCreatedAt": article.get("created_at"),
+            "intercomUpdatedAt": article.get("updated_at"),
+            "article_state": state,
+            "rag_collection_id": rag_collection_id,
+            "is_chunked": True,
+            "total_chunks": len(enriched_chunks),
+            "embedding_model": Config.EMBEDDING_MODEL,
+            "dimensions": Config.EMBEDDING_DIMENSIONS,
+            "is_multilingual_article": is_multilingual_article
+        }
         
         for i, contextualized_chunk in enumerate(enriched_chunks):
-            print(f" -> Processando chunk {i+1}/{len(enriched_chunks)}...")
+            logger.debug(" -> Processando chunk %d/%d...", i + 1, len(enriched_chunks))
             
             # Limpeza condicional inteligente
             clean_content = text_cleaner.clean_contextual_chunk(contextualized_chunk)
             
             if not clean_content:
-                print(f"   ⚠️ Chunk {i+1} vazio após limpeza, pulando.")
+                logger.warning("   ⚠️ Chunk %s vazio após limpeza, pulando.", i+1)
                 continue
 
-            # Embedding com título + conteúdo limpo
-            embedding_input = f"{title}\n\n{clean_content}"
-            embedding = components["embedding_generator"].generate(embedding_input)
-            
-            if not embedding:
-                print(f"   ❌ Falha ao gerar embedding para chunk {i+1}")
-                continue
+            embedding_input = title_prefix + clean_content
 
-            print(f"   ✅ Chunk {i+1} processado com sucesso")
-
-            # Documento final para MongoDB
+            # Documento final para MongoDB (embedding preenchido em lote abaixo)
             document = {
                 "title": title,
                 "content": clean_content,  # Conteúdo otimizado para embeddings
                 "category": category,
                 "language": lang,
-                "embedding": embedding,
-                "meta_data": {
-                    "source_type": "intercom_help_center_article",
-                    "article_id": str(article_id),
-                    "intercom_url": content.get("url", ""),
-                    "intercomCreatedAt": article.get("created_at"),
-                    "intercomUpdatedAt": article.get("updated_at"),
-                    "article_state": state,
-                    "rag_collection_id": rag_collection_id,
-                    "is_chunked": True,
-                    "chunk_index": i,
-                    "total_chunks": len(enriched_chunks),
-                    "embedding_model": Config.EMBEDDING_MODEL,
-                    "dimensions": Config.EMBEDDING_DIMENSIONS,
-                    "is_multilingual_article": str(article_id) in (multilingual_article_ids or [])
-                }
+                "embedding": None,
+                "meta_data": {**translation_meta, "chunk_index": i}
             }
-            documents_for_db.append(document)
-
-        print(f"✅ Artigo {article_id} processado: {len([d for d in documents_for_db if d['meta_data']['article_id'] == str(article_id)])} documentos gerados")
+            pending.append((document, embedding_input))
 
-    return documents_for_db
+    if not pending:
+        return documents_for_db
 
+    # ✅ ETAPA 6: Embeddings de todos os chunks do artigo em uma única chamada
+    logger.info(" -> Gerando embeddings em lote para %s chunks...", len(pending))
+    embeddings = components["embedding_generator"].generate_batch([text for _, text in pending])
 
-def fetch_all_articles_from_collection(intercom_client: IntercomClient, collection_id: str = None) -> dict:
-    """Busca TODOS os artigos da Intercom com paginação completa (opcionalmente por coleção)."""
-    all_articles = []
-    page = 1
-    per_page = 50
+    for (document, _), embedding in zip(pending, embeddings):
+        if not embedding:
+            logger.error("   ❌ Falha ao gerar embedding para chunk %s (%s)", document['meta_data']['chunk_index'] + 1, document['language'])
+            continue
+        document["embedding"] = embedding
+        documents_for_db.append(document)
 
-    if collection_id:
-        print(f"🔍 Buscando TODOS os artigos da coleção ID: {collection_id}")
-    else:
-        print("🔍 Buscando TODOS os artigos (sem filtro de coleção)")
+    # Nenhum embedding gerado indica falha da API (chave, cota...), não um
+    # artigo a pular: sobe como erro para entrar na contagem de falhas seguidas
+    if not documents_for_db:
+        raise RuntimeError(f"nenhum dos {len(pending)} embeddings do artigo {article_id} foi gerado")
 
-    while True:
-        print(f"📄 Processando página {page}...")
-        data = (
-            intercom_client.fetch_articles_from_collection(collection_id, page, per_page)
-            if collection_id else
-            intercom_client.fetch_articles(page, per_page)
-        )
+    logger.info("✅ Artigo %s processado: %s documentos gerados", article_id, len(documents_for_db))
 
-        if not data or "data" not in data or not data["data"]:
-            print(f"   → Página {page} vazia ou sem dados. Finalizando busca.")
-            break
+    return documents_for_db
 
-        articles_in_page = len(data["data"])
-        all_articles.extend(data["data"])
-        print(f"   → Encontrados {articles_in_page} artigos na página {page}")
 
-        if articles_in_page < per_page:
-            print(f"   → Última página detectada (menos de {per_page} artigos)")
-            break
+def iter_completed_articles(executor: ThreadPoolExecutor, process_article, articles, max_pending: int):
+    """
+    Submete os artigos ao executor à medida que chegam da paginação e devolve
+    os resultados conforme terminam, mantendo no máximo max_pending artigos em
+    andamento: a busca das páginas e o processamento (e o consumo dos
+    resultados) se sobrepõem, com memória limitada.
 
-        page += 1
+    Yields:
+        tuple: (ID do artigo, future concluído)
+    """
+    pending = {}
+    for article in articles:
+        pending[executor.submit(process_article, article)] = str(article.get("id", ""))
+        if len(pending) >= max_pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future
 
-    total_found = len(all_articles)
-    print(f"🎯 Total de artigos coletados: {total_found}")
-    return {"data": all_articles}
+    for future in as_completed(list(pending)):
+        yield pending.pop(future), future
 
 
 def main():
@@ -238,118 +279,197 @@ def main():
     - Usa módulo unificado de limpeza de texto
     - ✅ NOVO: Filtra idiomas baseado em lista de artigos multilíngues
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[logging.StreamHandler(sys.stdout)])
+
     try:
         Config.validate()
     except ValueError as e:
-        print(f"❌ Erro de configuração: {e}")
+        logger.error("❌ Erro de configuração: %s", e)
         return
 
     # ✅ Inicializa componentes incluindo o novo TextCleaner
+    # Compartilhados pelas threads de artigos: não guardam estado mutável entre
+    # chamadas (clientes OpenAI thread-safe, HTML2Text criado por chamada) e o
+    # MongoDBClient só é usado pela thread de gravação
+    # Cache das descrições de imagens (em disco com IMAGE_CACHE_PATH; senão só em memória)
+    image_cache = ImageDescriptionCache()
+    categorizer = ArticleCategorizer()
     components = {
         "intercom_client": IntercomClient(),
-        "text_processor": TextProcessor(),           # Agora preserva markdown
+        "text_processor": TextProcessor(image_cache=image_cache),  # Agora preserva markdown
         "chunker": LLMChunker(),
         "enricher": ContextualEnricher(),
-        "categorizer": ArticleCategorizer(),
+        "categorizer": categorizer,
+        # Categoria + contextos numa só chamada (ARTICLE_ANALYZER_MAX_CHARS=0 desativa)
+        "analyzer": ArticleAnalyzer(categorizer.categories) if Config.ARTICLE_ANALYZER_MAX_CHARS else None,
         "embedding_generator": EmbeddingGenerator(),
         "text_cleaner": TextCleaner(),              # ✅ Novo componente unificado
-        "mongodb_client": MongoDBClient()
+        "mongodb_client": MongoDBClient(),
+        # Cache opcional das etapas 1-4 por conteúdo (PIPELINE_CACHE_PATH)
+        "pipeline_cache": PipelineCache() if Config.PIPELINE_CACHE_PATH else None,
+        "image_cache": image_cache
     }
 
-    print("🚀 Iniciando pipeline de processamento de artigos da Intercom...")
-    print("📋 Pipeline: HTML → Markdown → Categorizar → Chunking → Enriquecimento → Limpeza → Embeddings")
-    print("🌍 Estratégia de idiomas: PT-BR por padrão, múltiplos idiomas para artigos específicos")
+    logger.info("🚀 Iniciando pipeline de processamento de artigos da Intercom...")
+    logger.info("📋 Pipeline: HTML → Markdown → Chunking → Categorizar + Enriquecimento → Limpeza → Embeddings")
+    logger.info("🌍 Estratégia de idiomas: PT-BR por padrão, múltiplos idiomas para artigos específicos")
 
     # ID da coleção RAG
     RAG_COLLECTION_ID = "16070792"  # or None
-    # ID dos artigos que podem ser descartados (se houver)
-    EXCLUDED_ARTICLE_IDS = ["7861154"]  # or None
-    
-    # IDs que devem ter todos os idiomas (PT, EN, ES)
-    MULTILINGUAL_ARTICLE_IDS = [
-        "7861149", "7915496", "8411647", "8887223", "7915619",
-        "7861109", "10008263", "7885145", "7992438", "7914908"
-    ]
 
-    print(f"\n📊 Configuração de idiomas:")
-    print(f" • Artigos multilíngues (PT/EN/ES): {len(MULTILINGUAL_ARTICLE_IDS)} IDs")
-    print(f" • Demais artigos: apenas PT-BR")
-    print(f" • IDs multilíngues: {', '.join(MULTILINGUAL_ARTICLE_IDS)}")
+    logger.info("\n📊 Configuração de idiomas:")
+    logger.info(" • Artigos multilíngues (PT/EN/ES): %s IDs", len(MULTILINGUAL_ARTICLE_IDS))
+    logger.info(" • Demais artigos: apenas PT-BR")
+    logger.info(" • IDs multilíngues: %s", ', '.join(sorted(MULTILINGUAL_ARTICLE_IDS)))
 
     # (Opcional) Listar coleções para encontrar a ID correta
     # list_all_collections(components["intercom_client"])
 
-    # Busca artigos
-    intercom_data = fetch_all_articles_from_collection(
-        components["intercom_client"],
-        collection_id=RAG_COLLECTION_ID
-    )
-
-    if not intercom_data or "data" not in intercom_data:
-        print("⚠️ Nenhum artigo da Intercom encontrado para processar.")
-        return
-
-    print(f"📊 Total de artigos encontrados: {len(intercom_data['data'])}")
-
-    # Processa artigos
-    all_processed_documents = []
+    # Processa artigos (documentos são enviados ao MongoDB em lotes, à medida
+    # que ficam prontos, para não manter todos os embeddings em memória)
+    pending_documents = []
+    total_documents = 0
+    lang_stats = Counter()
     processed_count = 0
     skipped_count = 0
     multilingual_processed = 0
     ptbr_only_processed = 0
 
-    for article in intercom_data["data"]:
-        article_id = str(article.get("id", ""))
-        
-        processed_docs = process_single_article(
-            article,
-            components,
-            RAG_COLLECTION_ID,
-            EXCLUDED_ARTICLE_IDS,
-            MULTILINGUAL_ARTICLE_IDS  # ✅ Passa a nova lista
-        )
-        
-        if processed_docs:
-            all_processed_documents.extend(processed_docs)
-            processed_count += 1
-            
-            # Conta estatísticas por tipo
-            if article_id in MULTILINGUAL_ARTICLE_IDS:
-                multilingual_processed += 1
-            else:
-                ptbr_only_processed += 1
-        else:
-            skipped_count += 1
+    # Os lotes são gravados no MongoDB por uma thread própria, para que a
+    # gravação não pare a submissão de novos artigos. Há no máximo um lote em
+    # gravação enquanto o próximo é acumulado (memória limitada)
+    mongo_writer = ThreadPoolExecutor(max_workers=1)
+    last_flush = None
+    writes_ok = True
+
+    def wait_last_flush():
+        """Aguarda o lote em gravação e registra se ele foi salvo sem erros."""
+        nonlocal last_flush, writes_ok
+        if last_flush is None:
+            return
+        try:
+            if not last_flush.result():
+                writes_ok = False
+        except Exception as e:
+            logger.error("❌ Erro ao gravar lote no MongoDB: %s", e)
+            writes_ok = False
+        last_flush = None
+
+    def flush(documents: list):
+        nonlocal last_flush
+        wait_last_flush()
+        last_flush = mongo_writer.submit(components["mongodb_client"].upsert_documents, documents)
+
+    # Artigos são independentes e dominados por latência de rede (LLM/embeddings),
+    # então são processados em paralelo, à medida que as páginas chegam da API
+    logger.info("⚙️ Processando artigos com %s workers em paralelo", Config.ARTICLE_WORKERS)
+    articles_found = 0
+    # Falhas seguidas (chave revogada, cota esgotada...) interrompem o pipeline
+    # em vez de consumir todos os artigos restantes
+    consecutive_failures = 0
+    aborted = False
+    try:
+        with ThreadPoolExecutor(max_workers=Config.ARTICLE_WORKERS) as executor:
+            completed = iter_completed_articles(
+                executor,
+                lambda article: process_single_article(
+                    article,
+                    components,
+                    RAG_COLLECTION_ID,
+                    EXCLUDED_ARTICLE_IDS,
+                    MULTILINGUAL_ARTICLE_IDS  # ✅ Passa o conjunto de artigos multilíngues
+                ),
+                components["intercom_client"].iter_articles(collection_id=RAG_COLLECTION_ID),
+                max_pending=Config.ARTICLE_WORKERS * 4
+            )
+
+            for article_id, future in completed:
+                articles_found += 1
+                try:
+                    processed_docs = future.result()
+                    consecutive_failures = 0
+                except Exception as e:
+                    logger.error("❌ Erro ao processar artigo %s: %s", article_id, e)
+                    processed_docs = []
+                    consecutive_failures += 1
+                    if Config.MAX_CONSECUTIVE_FAILURES and consecutive_failures >= Config.MAX_CONSECUTIVE_FAILURES:
+                        logger.error("🛑 %s artigos seguidos falharam. Abortando o processamento.", consecutive_failures)
+                        aborted = True
+                        # Para de submeter artigos e descarta os que ainda não começaram
+                        completed.close()
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        break
+                
+                if processed_docs:
+                    pending_documents.extend(processed_docs)
+                    total_documents += len(processed_docs)
+                    processed_count += 1
+
+                    # Estatísticas por idioma
+                    lang_stats.update(doc.get("language", "unknown") for doc in processed_docs)
+
+                    if len(pending_documents) >= Config.MONGODB_FLUSH_SIZE:
+                        logger.info("\n💾 Salvando lote de %s documentos no MongoDB...", len(pending_documents))
+                        flush(pending_documents)
+                        pending_documents = []
+                    
+                    # Conta estatísticas por tipo
+                    if article_id in MULTILINGUAL_ARTICLE_IDS:
+                        multilingual_processed += 1
+                    else:
+                        ptbr_only_processed += 1
+                else:
+                    skipped_count += 1
+    finally:
+        # Mesmo se a busca ou o processamento falharem, salva o que já foi
+        # gerado, aguarda as gravações e fecha as conexões
+        try:
+            if pending_documents:
+                logger.info("\n💾 Salvando %s documentos restantes no MongoDB...", len(pending_documents))
+                flush(pending_documents)
+                pending_documents = []
+            wait_last_flush()
+        finally:
+            mongo_writer.shutdown(wait=True)
+            components["mongodb_client"].close_connection()
+            components["intercom_client"].close()
+            if components["pipeline_cache"]:
+                components["pipeline_cache"].close()
+            components["image_cache"].close()
+            shutdown_process_pool()
+
+    if aborted:
+        logger.error("❌ Pipeline interrompido após %s falhas seguidas (%s documentos gerados antes da interrupção). "
+                     "Verifique a chave e a cota da OpenAI.", Config.MAX_CONSECUTIVE_FAILURES, total_documents)
+        sys.exit(1)
+
+    if not articles_found:
+        logger.warning("⚠️ Nenhum artigo da Intercom encontrado para processar.")
+        return
 
     # Relatório final detalhado
-    print(f"\n📈 Resumo do processamento:")
-    print(f" • Artigos processados: {processed_count}")
-    print(f"   - Multilíngues (PT/EN/ES): {multilingual_processed}")
-    print(f"   - Apenas PT-BR: {ptbr_only_processed}")
-    print(f" • Artigos pulados: {skipped_count}")
-    print(f" • Total de documentos gerados: {len(all_processed_documents)}")
-    
-    # Estatísticas por idioma
-    lang_stats = {}
-    for doc in all_processed_documents:
-        lang = doc.get("language", "unknown")
-        lang_stats[lang] = lang_stats.get(lang, 0) + 1
+    logger.info("\n📈 Resumo do processamento:")
+    logger.info(" • Artigos encontrados: %s", articles_found)
+    logger.info(" • Artigos processados: %s", processed_count)
+    logger.info("   - Multilíngues (PT/EN/ES): %s", multilingual_processed)
+    logger.info("   - Apenas PT-BR: %s", ptbr_only_processed)
+    logger.info(" • Artigos pulados: %s", skipped_count)
+    logger.info(" • Total de documentos gerados: %s", total_documents)
     
-    print(f"\n🌍 Distribuição por idioma:")
+    logger.info("\n🌍 Distribuição por idioma:")
     for lang, count in sorted(lang_stats.items()):
-        print(f" • {lang.upper()}: {count} documentos")
+        logger.info(" • %s: %s documentos", lang.upper(), count)
 
-    # Salva no MongoDB
-    if all_processed_documents:
-        print(f"\n💾 Salvando {len(all_processed_documents)} documentos no MongoDB...")
-        components["mongodb_client"].upsert_documents(all_processed_documents)
-        print("✅ Documentos salvos com sucesso!")
+    if not total_documents:
+        logger.error("❌ Nenhum documento foi gerado a partir dos artigos da Intercom.")
+    elif writes_ok:
+        logger.info("✅ Documentos salvos com sucesso!")
     else:
-        print("❌ Nenhum documento foi gerado a partir dos artigos da Intercom.")
+        logger.error("❌ Falha ao salvar documentos no MongoDB (veja os erros acima).")
 
-    print("\n🎉 Pipeline de artigos da Intercom concluído!")
-    print("📋 Processo seguiu as melhores práticas: markdown preservado até limpeza final para embeddings")
-    print("🌍 Filtro de idiomas aplicado: multilíngue para IDs específicos, PT-BR para demais")
+    logger.info("\n🎉 Pipeline de artigos da Intercom concluído!")
+    logger.info("📋 Processo seguiu as melhores práticas: markdown preservado até limpeza final para embeddings")
+    logger.info("🌍 Filtro de idiomas aplicado: multilíngue para IDs específicos, PT-BR para demais")
 
 
 if __name__ == "__main__":
@@ -1,3 +1,6 @@
+import logging
+import sys
+
 from config.settings import Config
 from src.api.kyte_client import generate_pricing_documents_from_api
 from src.utils.embeddings import EmbeddingGenerator
@@ -26,10 +29,11 @@ def update_pricing_knowledge():
     pricing_documents_raw = generate_pricing_documents_from_api()
 
     if pricing_documents_raw:
-        for doc in pricing_documents_raw:
-            embedding_text = f"{doc['title']}. {doc['content']}"
-            embedding = embedding_generator.generate(embedding_text)
-            
+        # Embeddings de todos os documentos em lote (uma requisição por lote)
+        embeddings = embedding_generator.generate_batch(
+            [f"{doc['title']}. {doc['content']}" for doc in pricing_documents_raw]
+        )
+        for doc, embedding in zip(pricing_documents_raw, embeddings):
             if embedding:
                 doc['embedding'] = embedding
                 doc['meta_data']['embedding_model'] = Config.EMBEDDING_MODEL
@@ -42,10 +46,13 @@ def update_pricing_knowledge():
     if all_pricing_documents:
         print(f"\n💾 Total de {len(all_pricing_documents)} documentos de preço para salvar.")
         mongodb_client.upsert_documents(all_pricing_documents)
+        mongodb_client.close_connection()
     else:
         print("❌ Nenhum documento de preço foi processado.")
 
     print("\n🎉 Pipeline de preços concluído!")
 
 if __name__ == "__main__":
+    # Os logs do MongoDBClient e do EmbeddingGenerator vão para o stdout, como os prints
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[logging.StreamHandler(sys.stdout)])
     update_pricing_knowledge()
\ No newline at end of file
@@ -2,10 +2,27 @@ from config.settings import Config
 from src.utils.embeddings import EmbeddingGenerator
 from src.mongodb.mongodb_client import MongoDBClient
 import json
+import logging
 import re
 from pathlib import Path
 from typing import Dict, Any, List
 
+try:
+    import ijson  # Opcional: leitura incremental de arquivos JSON grandes
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Opcional: parse mais rápido quando o arquivo é lido inteiro
+except ImportError:
+    orjson = None
+
+_JSON_ERRORS = (json.JSONDecodeError,) if ijson is None else (json.JSONDecodeError, ijson.JSONError)
+
+# Padrões de quebra do SemanticChunker, compilados uma única vez
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n+')        # linhas duplas/triplas
+_SENTENCE_BREAK_RE = re.compile(r'\.(?=\s+[A-Z])')   # ponto seguido de maiúscula
+
 class SemanticChunker:
     """Classe para fazer chunking semântico inteligente de textos"""
     
@@ -27,10 +44,14 @@ class SemanticChunker:
         if not text.strip():
             return chunks
         
-        # Primeiro, tentar quebrar por linhas duplas/triplas
-        sections = re.split(r'\n\s*\n+', text)
+        # Primeiro, tentar quebrar por linhas duplas/triplas (a quebra exige ao
+        # menos duas quebras de linha; sem elas o texto é uma seção única)
+        sections = _PARAGRAPH_BREAK_RE.split(text) if text.count("\n") >= 2 else [text]
         
-        current_chunk = ""
+        # Seções do chunk atual, unidas por "\n\n" só ao finalizar o chunk
+        # (evita concatenações repetidas de strings crescentes)
+        current_parts = []
+        current_len = 0
         chunk_index = 0
         
         for section in sections:
@@ -39,42 +60,46 @@ class SemanticChunker:
                 continue
             
             # Se adicionar esta seção não ultrapassar o limite, adiciona
-            if len(current_chunk + "\n\n" + section) <= self.max_chunk_size:
-                if current_chunk:
-                    current_chunk += "\n\n" + section
-                else:
-                    current_chunk = section
+            if current_len + 2 + len(section) <= self.max_chunk_size:
+                current_len += len(section) + (2 if current_parts else 0)
+                current_parts.append(section)
             else:
                 # Finaliza chunk atual se tem conteúdo suficiente
-                if len(current_chunk) >= self.min_chunk_size:
-                    chunks.append(self._create_chunk(current_chunk, title, chunk_index))
+                if current_len >= self.min_chunk_size:
+                    chunks.append(self._create_chunk("\n\n".join(current_parts), title, chunk_index))
                     chunk_index += 1
-                    current_chunk = section
+                    current_parts = [section]
+                    current_len = len(section)
                 else:
                     # Se chunk atual é muito pequeno, força junção
-                    current_chunk += "\n\n" + section
+                    if not current_parts:
+                        current_parts.append("")
+                    current_parts.append(section)
+                    current_len += 2 + len(section)
                 
                 # Se a seção atual é muito grande, quebra por pontos
-                if len(current_chunk) > self.max_chunk_size:
-                    sub_chunks = self._split_by_sentences(current_chunk)
+                if current_len > self.max_chunk_size:
+                    sub_chunks = self._split_by_sentences("\n\n".join(current_parts))
                     for i, sub_chunk in enumerate(sub_chunks):
                         if sub_chunk.strip():
                             chunks.append(self._create_chunk(sub_chunk, title, chunk_index))
                             chunk_index += 1
-                    current_chunk = ""
+                    current_parts = []
+                    current_len = 0
         
         # Adicionar último chunk se houver
-        if current_chunk.strip() and len(current_chunk) >= self.min_chunk_size:
-            chunks.append(self._create_chunk(current_chunk, title, chunk_index))
+        if current_parts and current_len >= self.min_chunk_size:
+            chunks.append(self._create_chunk("\n\n".join(current_parts), title, chunk_index))
         
         return chunks
     
     def _split_by_sentences(self, text: str) -> List[str]:
         """Quebra texto por pontos quando necessário"""
-        sentences = re.split(r'\.(?=\s+[A-Z])', text)
+        sentences = _SENTENCE_BREAK_RE.split(text)
         
         chunks = []
-        current_chunk = ""
+        current_parts = []
+        current_len = 0
         
         for sentence in sentences:
             sentence = sentence.strip()
@@ -85,30 +110,81 @@ class SemanticChunker:
             if not sentence.endswith(('.', '!', '?', ':')):
                 sentence += '.'
             
-            if len(current_chunk + " " + sentence) <= self.max_chunk_size:
-                if current_chunk:
-                    current_chunk += " " + sentence
-                else:
-                    current_chunk = sentence
+            if current_len + 1 + len(sentence) <= self.max_chunk_size:
+                current_len += len(sentence) + (1 if current_parts else 0)
+                current_parts.append(sentence)
             else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = sentence
+                if current_parts:
+                    chunks.append(" ".join(current_parts))
+                current_parts = [sentence]
+                current_len = len(sentence)
         
-        if current_chunk:
-            chunks.append(current_chunk)
+        if current_parts:
+            chunks.append(" ".join(current_parts))
         
         return chunks
     
     def _create_chunk(self, content: str, title: str, index: int) -> Dict[str, Any]:
         """Cria estrutura de chunk"""
+        content = content.strip()
         return {
-            "content": content.strip(),
+            "content": content,
             "title": title,
             "chunk_index": index,
-            "chunk_size": len(content.strip())
+            "chunk_size": len(content)
         }
 
+def iter_json_articles(json_file_path: str):
+    """
+    Itera sobre os artigos do arquivo JSON.
+    
+    Suporta dict com chave 'articles', lista de dicts, ou lista de dicts com chave 'articles'.
+    Com ijson instalado o arquivo é lido incrementalmente, um artigo por vez;
+    sem ele, o arquivo inteiro é carregado (com orjson, se instalado, ou json.load).
+    
+    Args:
+        json_file_path: Caminho para o arquivo JSON
+        
+    Yields:
+        Artigos do arquivo, na ordem em que aparecem
+    """
+    if ijson is None:
+        if orjson is not None:
+            # orjson.JSONDecodeError herda de json.JSONDecodeError
+            with open(json_file_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(json_file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        
+        if isinstance(data, dict) and "articles" in data:
+            yield from data["articles"]
+        elif isinstance(data, list):
+            # Se for lista de dicts com chave 'articles', pega os do primeiro
+            if len(data) > 0 and isinstance(data[0], dict) and "articles" in data[0]:
+                yield from data[0]["articles"]
+            else:
+                yield from data
+        return
+    
+    with open(json_file_path, 'rb') as f:
+        # O primeiro caractere relevante indica o formato do arquivo
+        head = f.read(1)
+        while head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        
+        if head == b'{':
+            yield from ijson.items(f, 'articles.item', use_float=True)
+        elif head == b'[':
+            items = ijson.items(f, 'item', use_float=True)
+            first = next(items, None)
+            if isinstance(first, dict) and "articles" in first:
+                yield from first["articles"]
+            elif first is not None:
+                yield first
+                yield from items
+
 def generate_documents_from_json(json_file_path: str) -> List[Dict[str, Any]]:
     """
     Gera documentos a partir do arquivo JSON com chunking semântico.
@@ -123,24 +199,11 @@ def generate_documents_from_json(json_file_path: str) -> List[Dict[str, Any]]:
     chunker = SemanticChunker(max_chunk_size=1000, min_chunk_size=100)
     
     try:
-        # Carregar o arquivo JSON
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Suporta dict com chave 'articles', lista de dicts, ou lista de dicts com chave 'articles'
-        if isinstance(data, dict) and "articles" in data:
-            articles = data["articles"]
-        elif isinstance(data, list):
-            # Se for lista de dicts com chave 'articles', pega todos
-            if len(data) > 0 and isinstance(data[0], dict) and "articles" in data[0]:
-                articles = data[0]["articles"]
-            else:
-                articles = data
-        else:
-            articles = []
-        print(f"📊 Encontrados {len(articles)} artigos no JSON para processar")
+        articles = iter_json_articles(json_file_path)
+        article_count = 0
 
         for i, article in enumerate(articles):
+            article_count += 1
             if not isinstance(article, dict):
                 print(f"⚠️  Pulando artigo {i+1}: formato inválido")
                 continue
@@ -149,7 +212,7 @@ def generate_documents_from_json(json_file_path: str) -> List[Dict[str, Any]]:
                 continue
             title = article.get('title', f'Artigo {i+1}')
             content = article.get('content', '')
-            print(f"📝 Processando artigo {i+1}/{len(articles)}: {title[:50]}...")
+            print(f"📝 Processando artigo {i+1}: {title[:50]}...")
             # Verificar se o conteúdo precisa de chunking
             if len(content) <= 1000:
                 # Conteúdo pequeno - criar documento único
@@ -190,13 +253,14 @@ def generate_documents_from_json(json_file_path: str) -> List[Dict[str, Any]]:
                     }
                     documents.append(document)
 
+        print(f"📊 Lidos {article_count} artigos do JSON")
         print(f"✅ Processados {len(documents)} documentos do JSON")
         return documents
         
     except FileNotFoundError:
         print(f"❌ Arquivo JSON não encontrado: {json_file_path}")
         return []
-    except json.JSONDecodeError as e:
+    except _JSON_ERRORS as e:
         print(f"❌ Erro ao decodificar JSON: {e}")
         return []
     except Exception as e:
@@ -235,13 +299,12 @@ def update_json_knowledge(json_file_path: str):
     print(f"\n🤖 Gerando embeddings para {len(json_documents)} documentos...")
     processed_documents = []
     
-    for i, doc in enumerate(json_documents):
-        print(f"🔄 Gerando embedding {i+1}/{len(json_documents)}")
-        
-        # Texto para embedding (título + conteúdo)
-        embedding_text = f"{doc['title']}. {doc['content']}"
-        embedding = embedding_generator.generate(embedding_text)
-        
+    # Texto para embedding (título + conteúdo), enviado em lotes à API
+    embeddings = embedding_generator.generate_batch(
+        [f"{doc['title']}. {doc['content']}" for doc in json_documents]
+    )
+    
+    for i, (doc, embedding) in enumerate(zip(json_documents, embeddings)):
         if embedding:
             doc['embedding'] = embedding
             doc['meta_data']['embedding_model'] = Config.EMBEDDING_MODEL
@@ -254,6 +317,7 @@ def update_json_knowledge(json_file_path: str):
     if processed_documents:
         print(f"\n💾 Salvando {len(processed_documents)} documentos no MongoDB...")
         mongodb_client.upsert_documents(processed_documents)
+        mongodb_client.close_connection()
         
         # Estatísticas
         chunked_docs = len([d for d in processed_documents if d["meta_data"]["is_chunked"]])
@@ -273,6 +337,9 @@ def main():
     Função principal que pode ser usada para testar o pipeline
     """
     import sys
+
+    # Os logs do MongoDBClient e do EmbeddingGenerator vão para o stdout, como os prints
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[logging.StreamHandler(sys.stdout)])
     
     if len(sys.argv) < 2:
         print("❌ Uso: python run_json_pipeline.py <caminho_para_arquivo_json>")
@@ -1,6 +1,12 @@
+import logging
 import requests
-from typing import Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional
 from config.settings import Config
+from src.utils.http_client import create_http_session, parse_json
+
+logger = logging.getLogger(__name__)
 
 class IntercomClient:
     def __init__(self):
@@ -9,6 +15,22 @@ class IntercomClient:
             "Authorization": f"Bearer {Config.INTERCOM_API_TOKEN}",
             "Accept": "application/json"
         }
+        # Sessão persistente: reaproveita conexões (keep-alive) entre as chamadas.
+        # O pool comporta (e limita) as páginas buscadas em paralelo; como cada
+        # página usa sua própria conexão já aberta, não há bloqueio entre elas
+        # (o ganho de multiplexação do HTTP/2 seria marginal aqui)
+        self.session = create_http_session(pool_maxsize=Config.INTERCOM_PAGE_WORKERS)
+        self.session.headers.update(self.headers)
+
+    def close(self) -> None:
+        """Fecha a sessão HTTP e libera as conexões do pool"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def fetch_articles(self, page_number: int = 1, per_page: int = 10) -> Optional[Dict]:
         """Busca artigos da API do Intercom (método original)"""
@@ -19,11 +41,11 @@ class IntercomClient:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return parse_json(response)
         except requests.exceptions.RequestException as e:
-            print(f"Erro ao buscar dados da API do Intercom: {e}")
+            logger.error("Erro ao buscar dados da API do Intercom: %s", e)
             return None
 
     def list_collections(self) -> Optional[Dict]:
@@ -36,11 +58,11 @@ class IntercomClient:
         url = f"{self.base_url}/help_center/collections"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return parse_json(response)
         except requests.exceptions.RequestException as e:
-            print(f"❌ Erro ao listar coleções: {e}")
+            logger.error("❌ Erro ao listar coleções: %s", e)
             return None
 
     def fetch_articles_from_collection(self, collection_id: str, page_number: int = 1, per_page: int = 50) -> Optional[Dict]:
@@ -62,13 +84,126 @@ class IntercomClient:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return parse_json(response)
         except requests.exceptions.RequestException as e:
-            print(f"❌ Erro ao buscar artigos da coleção {collection_id}: {e}")
+            logger.error("❌ Erro ao buscar artigos da coleção %s: %s", collection_id, e)
             return None
 
+    def iter_articles(self, collection_id: str = None, per_page: int = None,
+                      page_workers: int = None) -> Iterator[Dict]:
+        """
+        Itera sobre TODOS os artigos da Intercom com paginação completa (opcionalmente por coleção).
+
+        A primeira página informa o total de páginas (pages.total_pages); as demais
+        são buscadas em paralelo, com no máximo page_workers páginas em andamento,
+        e consumidas na ordem. Sem esse total, a próxima página é buscada em
+        segundo plano enquanto a atual é consumida, seguindo o link pages.next da
+        API (ou, sem ele, até uma página incompleta).
+
+        Ficam em memória no máximo a página atual e as page_workers em andamento
+        (O(page_workers × per_page)), nunca a lista completa. Fechar o generator
+        antes do fim cancela as buscas que ainda não começaram.
+
+        Yields:
+            dict: Um artigo por vez, na ordem das páginas
+        """
+        per_page = per_page or Config.INTERCOM_PAGE_SIZE
+        page_workers = page_workers or Config.INTERCOM_PAGE_WORKERS
+
+        def fetch_page(page_number: int) -> dict:
+            if collection_id:
+                return self.fetch_articles_from_collection(collection_id, page_number, per_page)
+            return self.fetch_articles(page_number, per_page)
+
+        def page_articles(page_number: int, data: dict) -> list:
+            logger.info("📄 Processando página %d...", page_number)
+            if not data or "data" not in data or not data["data"]:
+                logger.info("   → Página %d vazia ou sem dados. Finalizando busca.", page_number)
+                return []
+            logger.info("   → Encontrados %d artigos na página %d", len(data["data"]), page_number)
+            return data["data"]
+
+        def has_next_page(data: dict, articles_in_page: int) -> bool:
+            pages = data.get("pages") or {}
+            if pages:
+                return bool(pages.get("next"))
+            return articles_in_page >= per_page
+
+        if collection_id:
+            logger.info("🔍 Buscando TODOS os artigos da coleção ID: %s", collection_id)
+        else:
+            logger.info("🔍 Buscando TODOS os artigos (sem filtro de coleção)")
+
+        first_page = fetch_page(1)
+        articles = page_articles(1, first_page)
+        total_found = len(articles)
+        yield from articles
+
+        total_pages = (first_page or {}).get("pages", {}).get("total_pages")
+
+        if not articles:
+            logger.info("🎯 Total de artigos coletados: %d", total_found)
+            return
+
+        if isinstance(total_pages, int):
+            # Total conhecido: mantém até page_workers páginas sendo buscadas em
+            # paralelo, repondo uma a cada página consumida (memória limitada)
+            if total_pages > 1:
+                fetcher = ThreadPoolExecutor(max_workers=min(page_workers, total_pages - 1))
+                in_flight = deque()
+                next_page = 2
+                try:
+                    while True:
+                        while next_page <= total_pages and len(in_flight) < page_workers:
+                            in_flight.append((next_page, fetcher.submit(fetch_page, next_page)))
+                            next_page += 1
+                        if not in_flight:
+                            break
+
+                        page, future = in_flight.popleft()
+                        articles = page_articles(page, future.result())
+                        if not articles:
+                            break
+                        total_found += len(articles)
+                        yield from articles
+                finally:
+                    # Se o consumidor parar antes (generator fechado), as páginas
+                    # ainda não iniciadas são canceladas
+                    fetcher.shutdown(cancel_futures=True)
+        elif not has_next_page(first_page, len(articles)):
+            logger.info("   → Última página detectada")
+        else:
+            # Total desconhecido: pré-busca sequencial da próxima página
+            page = 2
+            prefetcher = ThreadPoolExecutor(max_workers=1)
+            try:
+                next_page = prefetcher.submit(fetch_page, page)
+
+                while True:
+                    data = next_page.result()
+                    articles = page_articles(page, data)
+                    if not articles:
+                        break
+
+                    is_last_page = not has_next_page(data, len(articles))
+                    if is_last_page:
+                        logger.info("   → Última página detectada")
+                    else:
+                        next_page = prefetcher.submit(fetch_page, page + 1)
+
+                    total_found += len(articles)
+                    yield from articles
+
+                    if is_last_page:
+                        break
+                    page += 1
+            finally:
+                prefetcher.shutdown(cancel_futures=True)
+
+        logger.info("🎯 Total de artigos coletados: %d", total_found)
+
     def fetch_all_articles_including_drafts(self, page_number: int = 1, per_page: int = 50) -> Optional[Dict]:
         """
         Busca todos os artigos da Intercom, incluindo rascunhos.
@@ -88,11 +223,11 @@ class IntercomClient:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return parse_json(response)
         except requests.exceptions.RequestException as e:
-            print(f"❌ Erro ao buscar artigos (incluindo rascunhos): {e}")
+            logger.error("❌ Erro ao buscar artigos (incluindo rascunhos): %s", e)
             return None
 
     def get_collection_details(self, collection_id: str) -> Optional[Dict]:
@@ -108,11 +243,11 @@ class IntercomClient:
         url = f"{self.base_url}/help_center/collections/{collection_id}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return parse_json(response)
         except requests.exceptions.RequestException as e:
-            print(f"❌ Erro ao buscar detalhes da coleção {collection_id}: {e}")
+            logger.error("❌ Erro ao buscar detalhes da coleção %s: %s", collection_id, e)
             return None
 
     def fetch_article_by_id(self, article_id: str) -> Optional[Dict]:
@@ -130,11 +265,11 @@ class IntercomClient:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return parse_json(response)
         except requests.exceptions.RequestException as e:
-            print(f"❌ Erro ao buscar artigo {article_id}: {e}")
+            logger.error("❌ Erro ao buscar artigo %s: %s", article_id, e)
             return None
 
     def search_articles(self, query: str, collection_id: str = None) -> Optional[Dict]:
@@ -157,11 +292,11 @@ class IntercomClient:
             params["collection_id"] = collection_id
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
-            return response.json()
+            return parse_json(response)
         except requests.exceptions.RequestException as e:
-            print(f"❌ Erro ao buscar artigos com query '{query}': {e}")
+            logger.error("❌ Erro ao buscar artigos com query '%s': %s", query, e)
             return None
 
     def test_connection(self) -> bool:
@@ -174,10 +309,10 @@ class IntercomClient:
         url = f"{self.base_url}/me"  # Endpoint para verificar autenticação
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            print("✅ Conexão com a API da Intercom estabelecida com sucesso")
+            logger.info("✅ Conexão com a API da Intercom estabelecida com sucesso")
             return True
         except requests.exceptions.RequestException as e:
-            print(f"❌ Erro de conexão com a API da Intercom: {e}")
+            logger.error("❌ Erro de conexão com a API da Intercom: %s", e)
             return False
\ No newline at end of file
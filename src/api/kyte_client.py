@@ -1,17 +1,27 @@
+import atexit
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
+from src.utils.http_client import create_http_session, parse_json
 
 # URL base da API de preços da Kyte
 KYTE_PRICES_API_BASE_URL = "https://kyte-prices.azurewebsites.net/plans/"
+# Requisições simultâneas à API de preços
+KYTE_MAX_CONCURRENCY = 4
+
+# Sessão do módulo: as chamadas de todos os países (e execuções seguintes no
+# mesmo processo) reaproveitam as conexões com o host da API
+_SESSION = create_http_session(pool_maxsize=KYTE_MAX_CONCURRENCY)
+atexit.register(_SESSION.close)
 
 def _fetch_prices_for_country(country_code: str) -> Dict[str, Any]:
     """Função auxiliar para buscar dados de preços para um único país."""
     url = f"{KYTE_PRICES_API_BASE_URL}{country_code.upper()}"
     try:
-        response = requests.get(url, timeout=10)
+        response = _SESSION.get(url, timeout=10)
         # Lança um erro para respostas HTTP ruins (4xx ou 5xx)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
     except requests.exceptions.RequestException as e:
         print(f"❌ Erro ao buscar preços da Kyte para o país '{country_code}': {e}")
         return {}
@@ -46,8 +56,11 @@ def generate_pricing_documents_from_api() -> List[Dict[str, Any]]:
 
     documents = []
 
-    for country_code in all_codes_to_fetch:
-        pricing_data = _fetch_prices_for_country(country_code)
+    # Os países são independentes: busca todos em paralelo (uma única espera de rede)
+    with ThreadPoolExecutor(max_workers=KYTE_MAX_CONCURRENCY) as executor:
+        prices_by_country = list(executor.map(_fetch_prices_for_country, all_codes_to_fetch))
+
+    for country_code, pricing_data in zip(all_codes_to_fetch, prices_by_country):
 
         if not pricing_data:
             print(f" -> Nenhum dado de preço encontrado para {country_code.upper()}, pulando.")
@@ -86,20 +99,6 @@ def generate_pricing_documents_from_api() -> List[Dict[str, Any]]:
                 "title": title,
                 "content": content,
                 "category": "billing_plans_and_pricing",
-                "language": "pt-BR",
-                "meta_data": {
-                    "source_type": "kyte_pricing_api",
-                    "article_id": f"pricing_{country_code}_{plan_name}",
-                    "is_chunked": False,
-                    "chunk_index": 0,
-                    "plan": plan_name.upper()
-                }
-            }
-
-            document = {
-                "title":title,
-                "content": content,
-                "category": "billing_plans_and_pricing",
                 "plans": plan_name.upper(),
                 "country": "INTERNATIONAL" if is_default_case else country_code.upper(),
                 "language": "pt-BR",
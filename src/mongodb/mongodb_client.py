@@ -1,6 +1,11 @@
-from pymongo import MongoClient, UpdateOne
+import logging
+from pymongo import ASCENDING, MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 from typing import List, Dict
 from config.settings import Config
+from src.utils.embeddings import quantize_int8
+
+logger = logging.getLogger(__name__)
 
 class MongoDBClient:
     def __init__(self):
@@ -9,77 +14,139 @@ class MongoDBClient:
         self.collection_name = Config.COLLECTION_NAME
         self.client = None
         self.collection = None
+        self.vector_dtype = Config.MONGODB_VECTOR_DTYPE
 
     def connect(self):
         """Estabelece conexão com MongoDB e define a coleção."""
         if not self.client:
-            self.client = MongoClient(self.connection_string)
+            # O cliente (e seu pool de conexões) é reaproveitado entre os upserts;
+            # feche com close_connection() ao final do pipeline
+            options = {"compressors": Config.MONGODB_COMPRESSORS} if Config.MONGODB_COMPRESSORS else {}
+            self.client = MongoClient(self.connection_string, **options)
             db = self.client[self.database_name]
             self.collection = db[self.collection_name]
+            self._ensure_upsert_index()
         return self.collection
 
+    def _ensure_upsert_index(self):
+        """Garante o índice composto usado pelo filtro dos upserts (idempotente)."""
+        try:
+            self.collection.create_index(
+                [("meta_data.article_id", ASCENDING), ("language", ASCENDING), ("meta_data.chunk_index", ASCENDING)],
+                name="upsert_key"
+            )
+        except PyMongoError as e:
+            logger.warning("⚠️ Não foi possível criar o índice de upsert: %s", e)
+
     def close_connection(self):
-        """Fecha a conexão com o MongoDB."""
+        """Fecha a conexão com o MongoDB (chamar uma vez, ao encerrar o pipeline)."""
         if self.client:
             self.client.close()
             self.client = None
-            print("Conexão com o MongoDB fechada.")
+            logger.info("Conexão com o MongoDB fechada.")
 
-    def upsert_documents(self, documents: List[Dict]) -> None:
+    def _to_binary_vector(self, doc: Dict) -> Dict:
+        """
+        Converte o embedding em BSON Binary vector (subtipo 9), no formato de
+        MONGODB_VECTOR_DTYPE:
+        - float32: 4 bytes por valor em vez de 8
+        - int8: 1 byte por valor; escala linear pelo maior valor absoluto,
+          registrada em meta_data.embedding_scale (valor ≈ int8 * escala;
+          ver dequantize_int8)
+        """
+        from bson.binary import Binary, BinaryVectorDtype  # pymongo >= 4.10
+
+        embedding = doc.get("embedding")
+        if not embedding or isinstance(embedding, Binary):
+            return doc
+
+        if self.vector_dtype == "int8":
+            quantized, scale = quantize_int8(embedding)
+            meta_data = {**doc.get("meta_data", {}), "embedding_scale": scale}
+            return {**doc, "embedding": Binary.from_vector(quantized, BinaryVectorDtype.INT8), "meta_data": meta_data}
+
+        return {**doc, "embedding": Binary.from_vector(embedding, BinaryVectorDtype.FLOAT32)}
+
+    def _build_upsert(self, doc: Dict) -> UpdateOne:
+        """Cria a operação de upsert de um documento, identificado por artigo, idioma e chunk."""
+        meta = doc.get("meta_data", {})
+        filter_query = {
+            "meta_data.article_id": meta.get("article_id"),
+            "language": doc.get("language"),
+            "meta_data.chunk_index": meta.get("chunk_index")
+        }
+        if self.vector_dtype in ("float32", "int8"):
+            doc = self._to_binary_vector(doc)
+        return UpdateOne(filter_query, {"$set": doc}, upsert=True)
+
+    def upsert_documents(self, documents: List[Dict], batch_size: int = 500) -> bool:
         """
         Faz o upsert dos documentos processados para a coleção KyteFAQKnowledgeBase no MongoDB.
+        A conexão permanece aberta para os próximos lotes.
+        As operações são enviadas com bulk_write não ordenado, em lotes de até
+        batch_size documentos.
+
+        Returns:
+            bool: True se todos os documentos foram gravados sem erros; False se
+            houve erros de escrita ou falha na operação
         """
         if not documents:
-            print("⚠️ Nenhum documento para salvar no MongoDB.")
-            return
+            logger.warning("⚠️ Nenhum documento para salvar no MongoDB.")
+            return True
 
         try:
             collection = self.connect()
 
             # (O Bloco de Debug 1 pode ser removido se você não precisar mais dele)
-            print("\n--- 🕵️‍♂️ Verificando Configurações do MongoDB ---")
+            logger.info("\n--- 🕵️‍♂️ Verificando Configurações do MongoDB ---")
             if self.connection_string and len(self.connection_string) > 30:
-                 print(f"CONEXÃO: {self.connection_string[:20]}...{self.connection_string[-10:]}")
+                 logger.info("CONEXÃO: %s...%s", self.connection_string[:20], self.connection_string[-10:])
             else:
-                 print("CONEXÃO: (String de conexão inválida ou curta)")
-            print(f"BANCO DE DADOS: {self.database_name}")
-            print(f"COLEÇÃO: {collection.name}")
-            print("-------------------------------------------\n")
-
-            print(f"Iniciando upsert de {len(documents)} documentos...")
-            operations = []
-            for doc in documents:
-                meta = doc.get("meta_data", {})
-                filter_query = {
-                    "meta_data.article_id": meta.get("article_id"),
-                    "meta_data.language": doc.get("language"),
-                    "meta_data.chunk_index": meta.get("chunk_index")
-                }
-                update_operation = UpdateOne(filter_query, {"$set": doc}, upsert=True)
-                operations.append(update_operation)
-
-            if operations:
-                result = collection.bulk_write(operations)
-                
-                # --- CÓDIGO CORRIGIDO AQUI ---
+                 logger.info("CONEXÃO: (String de conexão inválida ou curta)")
+            logger.info("BANCO DE DADOS: %s", self.database_name)
+            logger.info("COLEÇÃO: %s", collection.name)
+            logger.info("-------------------------------------------\n")
+
+            logger.info("Iniciando upsert de %s documentos em lotes de até %s...", len(documents), batch_size)
+            n_upserted = 0
+            n_modified = 0
+            write_errors = []
+
+            for start in range(0, len(documents), batch_size):
+                operations = [self._build_upsert(doc) for doc in documents[start:start + batch_size]]
+
+                # ordered=False: o servidor aplica as operações sem serializá-las e
+                # uma falha isolada não interrompe o restante do lote
+                try:
+                    result = collection.bulk_write(operations, ordered=False)
+                    api_result = result.bulk_api_result
+                except BulkWriteError as bwe:
+                    # Em modo não ordenado as demais operações já foram aplicadas;
+                    # o resultado parcial vem nos detalhes da exceção
+                    api_result = bwe.details
+
                 # Acessamos o dicionário da API diretamente, que é mais seguro
-                api_result = result.bulk_api_result
-                print(" -> Operação de Bulk Write enviada.")
-                print(f" -> Resultado Completo da API: {api_result}")
-
-                # Verificamos se a chave 'writeErrors' existe e não está vazia
-                if api_result.get('writeErrors'):
-                    print("\n❌ ERROS DE ESCRITA ENCONTRADOS PELO MONGODB:")
-                    for error in api_result['writeErrors']:
-                        print(f"  - Índice: {error.get('index')}, Código: {error.get('code')}, Mensagem: {error.get('errmsg')}")
-                # --- FIM DA CORREÇÃO ---
-
-                print("\n ✅ --- Resumo da Operação ---")
-                # Usamos os valores do resultado da API para o log
-                print(f" -> {api_result.get('nUpserted', 0)} documentos inseridos (upsert).")
-                print(f" -> {api_result.get('nModified', 0)} documentos atualizados.")
+                n_upserted += api_result.get('nUpserted', 0)
+                n_modified += api_result.get('nModified', 0)
+                # Índices dos erros são relativos ao lote; converte para a lista completa
+                for error in api_result.get('writeErrors') or []:
+                    write_errors.append({**error, 'index': start + error.get('index', 0)})
+                logger.info(" -> Lote %s enviado: %s operações (%s inseridos, %s atualizados).",
+                            start // batch_size + 1, len(operations),
+                            api_result.get('nUpserted', 0), api_result.get('nModified', 0))
+
+            # Verificamos se houve erros de escrita em algum lote
+            if write_errors:
+                logger.error("\n❌ ERROS DE ESCRITA ENCONTRADOS PELO MONGODB:")
+                for error in write_errors:
+                    logger.error("  - Índice: %s, Código: %s, Mensagem: %s", error.get('index'), error.get('code'), error.get('errmsg'))
+
+            logger.info("\n ✅ --- Resumo da Operação ---")
+            # Usamos os valores somados dos resultados da API para o log
+            logger.info(" -> %s documentos inseridos (upsert).", n_upserted)
+            logger.info(" -> %s documentos atualizados.", n_modified)
+            return not write_errors
         
         except Exception as e:
-            print(f"❌ Erro CRÍTICO durante a operação com o MongoDB: {e}")
-        finally:
-            self.close_connection()
\ No newline at end of file
+            logger.error("❌ Erro CRÍTICO durante a operação com o MongoDB: %s", e)
+            return False
\ No newline at end of file
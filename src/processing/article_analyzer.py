@@ -0,0 +1,93 @@
+import json
+import logging
+from config.settings import Config
+from src.processing.contextual_enricher import apply_context
+from src.processing.llm_cache import cached_completion
+from src.utils.openai_client import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+class ArticleAnalyzer:
+    """
+    Categoriza o artigo e gera o contexto de todos os seus chunks em uma única
+    chamada à OpenAI (saída JSON), em vez de uma chamada de categorização mais
+    uma de enriquecimento por chunk, cada uma reenviando o documento inteiro.
+    """
+
+    def __init__(self, categories: list):
+        self.client = get_openai_client()
+        self.categories = categories
+        self.max_chars = Config.ARTICLE_ANALYZER_MAX_CHARS
+
+    def analyze(self, full_text: str, title: str, chunks: list, language: str) -> tuple[str, list] | None:
+        """
+        Retorna (categoria, chunks enriquecidos), na ordem dos chunks recebidos.
+
+        Retorna None quando o documento é longo demais para uma única chamada
+        (ARTICLE_ANALYZER_MAX_CHARS) ou quando a resposta é inválida; nesse caso
+        o chamador deve seguir pelo caminho separado (categorizer + enricher).
+        """
+        if not chunks or len(full_text) > self.max_chars:
+            return None
+
+        formatted_chunks = "\n\n".join(
+            f"<chunk id=\"{i}\">\n{chunk}\n</chunk>" for i, chunk in enumerate(chunks)
+        )
+        prompt = f"""
+        Você é um especialista em conteúdo de uma central de ajuda de software. Você receberá um artigo completo e os chunks em que ele foi dividido.
+
+        Tarefa 1 - Classifique o artigo em UMA das seguintes categorias:
+        {', '.join(self.categories)}
+
+        - 'how_to': Para tutoriais e guias passo a passo sobre como usar uma funcionalidade.
+        - 'features': Para descrições de funcionalidades, o que são e para que servem.
+        - 'troubleshooting': Para artigos que ajudam a resolver problemas, erros ou comportamentos inesperados.
+        - 'billing_plans_and_pricing': Para artigos sobre preços, planos, assinaturas e cobranças.
+        - 'technical_support': Para informações gerais de suporte, como comunicados, avisos de manutenção ou como entrar em contato.
+
+        Tarefa 2 - Para CADA chunk, gere um contexto curto e sucinto para situá-lo dentro do documento, com o objetivo de melhorar a recuperação da busca (search retrieval).
+        O contexto deve responder a perguntas como: Qual é o tópico principal do documento? Qual subtópico ou plataforma específica (ex: Kyte PDV, Kyte Web) este chunk aborda? Qual é a intenção deste chunk (ex: passo a passo, dica, introdução)?
+        Cada contexto deve ter no máximo 80 tokens e ser escrito no idioma: {language}.
+
+        TÍTULO DO ARTIGO: "{title}"
+
+        <document>
+        {full_text}
+        </document>
+
+        {formatted_chunks}
+
+        Responda APENAS com um objeto JSON no formato:
+        {{"category": "<categoria>", "contexts": ["<contexto do chunk 0>", "<contexto do chunk 1>", ...]}}
+        A lista "contexts" deve ter exatamente {len(chunks)} itens, na ordem dos chunks.
+        """
+
+        logger.debug("  -> Analisando artigo (categoria + contexto de %s chunks) com LLM...", len(chunks))
+        try:
+            result = json.loads(cached_completion(
+                self.client,
+                model=Config.RAG_ANALYZER_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                temperature=0.0,
+                max_tokens=100 * len(chunks) + 50
+            ))
+        except Exception as e:
+            logger.warning("Erro na análise combinada do artigo, usando etapas separadas: %s", e)
+            return None
+
+        contexts = result.get("contexts") if isinstance(result, dict) else None
+        if not isinstance(contexts, list) or len(contexts) != len(chunks):
+            logger.warning("Resposta da análise combinada inválida, usando etapas separadas")
+            return None
+
+        category = result.get("category")
+        if category not in self.categories:
+            logger.warning("  -> Categoria '%s' inválida, usando 'technical_support'", category)
+            category = 'technical_support'
+
+        enriched_chunks = [
+            apply_context(str(context).strip(), chunk) if context and str(context).strip() else chunk
+            for context, chunk in zip(contexts, chunks)
+        ]
+        return category, enriched_chunks
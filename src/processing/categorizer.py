@@ -1,9 +1,13 @@
-from openai import OpenAI
+import logging
 from config.settings import Config
+from src.processing.llm_cache import cached_completion
+from src.utils.openai_client import get_openai_client
+
+logger = logging.getLogger(__name__)
 
 class ArticleCategorizer:
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = get_openai_client()
         self.categories = [
             'technical_support', 
             'features', 
@@ -34,22 +38,22 @@ class ArticleCategorizer:
         Responda APENAS com o nome da categoria mais apropriada da lista.
         """
         
-        print("  -> Categorizando artigo com LLM...")
+        logger.debug("  -> Categorizando artigo com LLM...")
         try:
-            response = self.client.chat.completions.create(
+            category = cached_completion(
+                self.client,
                 model=Config.RAG_CATEGORIZER_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.0
-            )
-            category = response.choices[0].message.content.strip()
+            ).strip()
             # Garante que a resposta seja uma das categorias válidas
             if category in self.categories:
                 return category
             else:
-                print(f"  -> Categoria '{category}' inválida, usando 'technical_support'")
+                logger.warning("  -> Categoria '%s' inválida, usando 'technical_support'", category)
                 return 'technical_support'
                 
         except Exception as e:
             # Fallback em caso de erro
-            print(f"Erro ao categorizar artigo: {e}")
+            logger.error("Erro ao categorizar artigo: %s", e)
             return 'technical_support'
\ No newline at end of file
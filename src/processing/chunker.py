@@ -1,21 +1,37 @@
+import logging
 import re
-from openai import OpenAI
 from config.settings import Config
+from src.processing.llm_cache import cached_completion
+from src.utils.openai_client import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+# Quebra antes de qualquer cabeçalho markdown (#, ##, ###...)
+_HEADER_SPLIT_RE = re.compile(r'\n(?=#+ )')
+# Números na resposta do LLM (índices de quebra)
+_INT_RE = re.compile(r'\d+')
 
 class LLMChunker:
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = get_openai_client()
         self.max_chunk_size = Config.MAX_CHUNK_SIZE
+        self.small_article_threshold = Config.SMALL_ARTICLE_THRESHOLD
     
     def chunk_text(self, full_text: str) -> list:
         """Implementa LLM Chunking semântico"""
+        # Artigos curtos cabem em um único chunk autocontido: dispensa o LLM
+        if len(full_text) <= self.small_article_threshold:
+            full_text = full_text.strip()
+            logger.debug("  -> Artigo curto. Retornando chunk único sem LLM.")
+            return [full_text] if full_text else []
+
         # Divisão preliminar
         # Divide o texto sempre que encontrar um cabeçalho de qualquer nível (#, ##, ###).
-        preliminary_chunks = re.split(r'\n(?=#+ )', full_text)
+        preliminary_chunks = _HEADER_SPLIT_RE.split(full_text)
         preliminary_chunks = [chunk.strip() for chunk in preliminary_chunks if chunk and chunk.strip()]
 
         if len(preliminary_chunks) <= 1:
-            print("  -> Apenas um chunk. Retornando sem LLM.")
+            logger.debug("  -> Apenas um chunk. Retornando sem LLM.")
             return preliminary_chunks
 
         # Formatar para o LLM
@@ -39,15 +55,15 @@ class LLMChunker:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=Config,
+            split_suggestions = cached_completion(
+                self.client,
+                model=Config.RAG_CHUNKER_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.0
-            )
-            split_suggestions = response.choices[0].message.content.strip()
-            split_indices = {int(i) for i in re.findall(r'\d+', split_suggestions)}
+            ).strip()
+            split_indices = {int(i) for i in _INT_RE.findall(split_suggestions)}
         except Exception as e:
-            print(f"Erro no LLM Chunking: {e}")
+            logger.error("Erro no LLM Chunking: %s", e)
             return preliminary_chunks
 
         # Reagrupar chunks
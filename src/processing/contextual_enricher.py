@@ -1,51 +1,71 @@
-from openai import OpenAI
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from config.settings import Config
+from src.processing.llm_cache import cached_completion
+from src.utils.openai_client import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+
+def apply_context(context: str, chunk: str) -> str:
+    """Monta o chunk final com o contexto gerado antes do conteúdo original."""
+    return f"Contexto: {context}\n\n---\n\n{chunk}"
+
 
 class ContextualEnricher:
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = get_openai_client()
     
     def enrich_chunks(self, chunks: list, full_document_text: str, language: str) -> list:
         """Adiciona contexto a cada chunk usando a metodologia "Contextual Retrieval" da Anthropic.
         O objetivo é tornar cada chunk mais autocontido para melhorar a busca (RAG).
+
+        Os chunks são enriquecidos em paralelo (limitados pelo semáforo global da
+        OpenAI) e devolvidos na ordem original.
+        """
+        logger.debug("  -> Enriquecendo %s chunks no idioma: %s ...", len(chunks), language)
+
+        if len(chunks) <= 1:
+            return [self._enrich_one(i, chunk, full_document_text, language) for i, chunk in enumerate(chunks)]
+
+        with ThreadPoolExecutor(max_workers=min(len(chunks), Config.OPENAI_MAX_CONCURRENCY)) as executor:
+            return list(executor.map(
+                lambda item: self._enrich_one(item[0], item[1], full_document_text, language),
+                enumerate(chunks)
+            ))
+
+    def _enrich_one(self, i: int, chunk: str, full_document_text: str, language: str) -> str:
+        """Gera o contexto de um chunk; em caso de erro devolve o chunk original."""
+        prompt = f"""
+        Você receberá um documento completo e um chunk específico desse documento.
+        Sua tarefa é gerar um contexto curto e sucinto para situar este chunk dentro do documento, com o objetivo de melhorar a recuperação da busca (search retrieval).
+        O contexto deve responder a perguntas como: Qual é o tópico principal do documento? Qual subtópico ou plataforma específica (ex: Kyte PDV, Kyte Web) este chunk aborda? Qual é a intenção deste chunk (ex: passo a passo, dica, introdução)?
+
+        <document>
+        {full_document_text}
+        </document>
+
+        <chunk>
+        {chunk}
+        </chunk>
+
+        Responda APENAS com o contexto sucinto e nada mais. 
+        Limite sua resposta a no máximo 80 tokens.
+        Sua resposta deve ser no idioma: {language}.
         """
-        enriched_chunks = []
-        print(f"  -> Enriquecendo {len(chunks)} chunks no idioma: {language} ...")
         
-        for i, chunk in enumerate(chunks):
-            prompt = f"""
-            Você receberá um documento completo e um chunk específico desse documento.
-            Sua tarefa é gerar um contexto curto e sucinto para situar este chunk dentro do documento, com o objetivo de melhorar a recuperação da busca (search retrieval).
-            O contexto deve responder a perguntas como: Qual é o tópico principal do documento? Qual subtópico ou plataforma específica (ex: Kyte PDV, Kyte Web) este chunk aborda? Qual é a intenção deste chunk (ex: passo a passo, dica, introdução)?
-
-            <document>
-            {full_document_text}
-            </document>
-
-            <chunk>
-            {chunk}
-            </chunk>
-
-            Responda APENAS com o contexto sucinto e nada mais. 
-            Limite sua resposta a no máximo 80 tokens.
-            Sua resposta deve ser no idioma: {language}.
-            """
+        try:
+            context = cached_completion(
+                self.client,
+                model=Config.RAG_CONTEXTUAL_ENRICHER_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.1,
+                max_tokens=80
+            ).strip()
+            # Prepara o chunk final com o contexto
+            return apply_context(context, chunk)
             
-            try:
-                response = self.client.chat.completions.create(
-                    model=Config.RAG_CONTEXTUAL_ENRICHER_MODEL,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.1,
-                    max_tokens=80
-                )
-                context = response.choices[0].message.content.strip()
-                # Prepara o chunk final com o contexto
-                final_chunk = f"Contexto: {context}\n\n---\n\n{chunk}"
-                enriched_chunks.append(final_chunk)
-                
-            except Exception as e:
-                # Adiciona o chunk original em caso de erro
-                print(f"Erro ao enriquecer chunk {i+1}, adicionando sem contexto: {e}")
-                enriched_chunks.append(chunk)
-
-        return enriched_chunks
\ No newline at end of file
+        except Exception as e:
+            # Devolve o chunk original em caso de erro
+            logger.warning("Erro ao enriquecer chunk %s, adicionando sem contexto: %s", i+1, e)
+            return chunk
@@ -1,35 +1,137 @@
+import atexit
+import logging
+import multiprocessing
 import requests
 import io
+import re
 import base64
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from PIL import Image, UnidentifiedImageError
-from openai import OpenAI
 from config.settings import Config
+from src.utils.http_client import create_http_session
+from src.utils.openai_client import get_openai_client, openai_slot
+
+logger = logging.getLogger(__name__)
 
 REFUSAL_SNIPPETS = (
     "não posso ver", "não consigo ver", "não posso analisar",
     "i can't view", "i cannot view", "unable to view", "can't see",
 )
+# Todos os trechos numa única varredura da legenda
+_REFUSAL_RE = re.compile("|".join(map(re.escape, REFUSAL_SNIPPETS)))
 
-class ImageProcessor:
-    def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Cria sob demanda o pool de processos usado no preparo das imagens.
+
+    O pool nasce a partir das threads de artigos/imagens, com locks (logging,
+    requests, openai_slot) possivelmente ocupados: com "fork" o filho herdaria
+    esses locks travados. "spawn" inicia cada worker num interpretador limpo.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=Config.IMAGE_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Encerra o pool de processos, se criado (fim do pipeline e atexit)."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+            _process_pool = None
+
+
+atexit.register(shutdown_process_pool)
 
-    def _is_animated(self, image: Image.Image, response_headers: dict) -> bool:
-        ct = (response_headers.get("Content-Type") or "").lower()
-        if "gif" in ct:
+
+def _is_animated(image: Image.Image, content_type: str) -> bool:
+    if "gif" in content_type.lower():
+        return True
+    try:
+        if getattr(image, "is_animated", False):
             return True
-        try:
-            if getattr(image, "is_animated", False):
-                return True
-            n_frames = getattr(image, "n_frames", 1)
-            return n_frames and n_frames > 1
-        except Exception:
-            return False
-
-    def _should_skip_by_size(self, image: Image.Image) -> bool:
-        # ícones / selos / logos pequenos raramente têm valor semântico para RAG
-        w, h = image.size
-        return (w < 80 or h < 80)
+        n_frames = getattr(image, "n_frames", 1)
+        return n_frames and n_frames > 1
+    except Exception:
+        return False
+
+
+def _should_skip_by_size(image: Image.Image) -> bool:
+    # ícones / selos / logos pequenos raramente têm valor semântico para RAG
+    w, h = image.size
+    return (w < 80 or h < 80)
+
+
+def prepare_jpeg_b64(content: bytes, content_type: str) -> str | None:
+    """
+    Decodifica, normaliza e reduz a imagem, devolvendo o JPEG em base64.
+    Retorna None se a imagem não valer a descrição (não-imagem, animada ou ícone).
+
+    Função de módulo (e sem estado) para poder rodar num pool de processos.
+    """
+    try:
+        image = Image.open(io.BytesIO(content))
+    except UnidentifiedImageError:
+        logger.debug("    -> Conteúdo não é imagem, pulando")
+        return None
+
+    # Pular GIFs / animadas
+    if _is_animated(image, content_type):
+        logger.debug("    -> GIF/animada detectada, pulando")
+        return None
+
+    # Pular ícones muito pequenos
+    if _should_skip_by_size(image):
+        logger.debug("    -> Ícone pequeno (%sx%s), pulando", image.size[0], image.size[1])
+        return None
+
+    # JPEGs grandes são decodificados já reduzidos (escala DCT 1/2, 1/4, 1/8),
+    # sem ficar abaixo do tamanho final: evita decodificar e reamostrar todos os pixels
+    image.draft('RGB', (1024, 1024))
+
+    # Normaliza para JPEG opaco
+    if image.mode in ('RGBA', 'P', 'LA'):
+        bg = Image.new('RGB', image.size, (255, 255, 255))
+        bg.paste(image.convert('RGBA'),
+                 mask=image.convert('RGBA').split()[-1] if 'A' in image.getbands() else None)
+        image = bg
+    else:
+        image = image.convert('RGB')
+
+    # Redimensiona (mantém proporção) e comprime
+    image.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+    # As wheels do Pillow já trazem o libjpeg-turbo (encoder SIMD); veja
+    # PIL.features.check_feature("libjpeg_turbo")
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=70)
+    return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+
+class ImageProcessor:
+    def __init__(self, cache=None):
+        self.client = get_openai_client()
+        # Cache opcional de descrições (ImageDescriptionCache)
+        self.cache = cache
+        # Sessão compartilhada para baixar as imagens (reaproveita conexões com a CDN)
+        self.session = create_http_session(pool_maxsize=Config.IMAGE_DOWNLOAD_CONCURRENCY)
+        self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
+
+    def _prepare_image(self, content: bytes, content_type: str) -> str | None:
+        """Prepara a imagem no pool de processos (se configurado) ou na própria thread."""
+        if Config.IMAGE_PROCESS_WORKERS > 0:
+            return _get_process_pool().submit(prepare_jpeg_b64, content, content_type).result()
+        return prepare_jpeg_b64(content, content_type)
 
     def _sanitize_caption(self, text: str) -> str | None:
         if not text:
@@ -37,53 +139,60 @@ class ImageProcessor:
         t = " ".join(text.strip().split())
         # bloqueia respostas de recusa / placeholders
         low = t.lower()
-        if any(snippet in low for snippet in REFUSAL_SNIPPETS):
+        if _REFUSAL_RE.search(low):
             return None
         # força 1 sentença curta
         if len(t) > 220:
             t = t[:220].rsplit(" ", 1)[0] + "..."
         return t
 
+    def describe_images(self, image_urls: list) -> list:
+        """
+        Descreve várias imagens em paralelo (download + visão), limitado pelo
+        semáforo global da OpenAI. Retorna as descrições na ordem das URLs.
+
+        URLs repetidas (a mesma imagem usada várias vezes no artigo) são
+        descritas uma única vez.
+        """
+        unique_urls = list(dict.fromkeys(image_urls))
+        if len(unique_urls) <= 1:
+            descriptions = [self.describe_image(url) for url in unique_urls]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(unique_urls), Config.OPENAI_MAX_CONCURRENCY)) as executor:
+                descriptions = list(executor.map(self.describe_image, unique_urls))
+
+        by_url = dict(zip(unique_urls, descriptions))
+        return [by_url[url] for url in image_urls]
+
     def describe_image(self, image_url: str) -> str | None:
         """
         Descreve a imagem de forma concisa. Retorna None se não valer a pena injetar.
         """
+        cache = self.cache
+        url_key = cache.url_key(image_url) if cache else None
+        if cache:
+            found, description = cache.get(url_key)
+            if found:
+                logger.debug("    -> Descrição da imagem reaproveitada do cache")
+                return description
+
         try:
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            resp = requests.get(image_url, headers=headers, timeout=15)
+            resp = self.session.get(image_url, timeout=15)
             resp.raise_for_status()
 
-            try:
-                image = Image.open(io.BytesIO(resp.content))
-            except UnidentifiedImageError:
-                print(f"    -> Conteúdo não é imagem, pulando")
-                return None
-
-            # Pular GIFs / animadas
-            if self._is_animated(image, resp.headers):
-                print(f"    -> GIF/animada detectada, pulando")
-                return None
+            cache_keys = [url_key, cache.content_key(resp.content)] if cache else []
+            if cache:
+                found, description = cache.get(cache_keys[1])
+                if found:
+                    cache.set(cache_keys[:1], description)
+                    return description
 
-            # Pular ícones muito pequenos
-            if self._should_skip_by_size(image):
-                print(f"    -> Ícone pequeno ({image.size[0]}x{image.size[1]}), pulando")
+            b64 = self._prepare_image(resp.content, resp.headers.get("Content-Type") or "")
+            if b64 is None:
+                if cache:
+                    cache.set(cache_keys, None)
                 return None
 
-            # Normaliza para JPEG opaco
-            if image.mode in ('RGBA', 'P', 'LA'):
-                bg = Image.new('RGB', image.size, (255, 255, 255))
-                bg.paste(image.convert('RGBA'),
-                         mask=image.convert('RGBA').split()[-1] if 'A' in image.getbands() else None)
-                image = bg
-            else:
-                image = image.convert('RGB')
-
-            # Redimensiona (mantém proporção) e comprime
-            image.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
-            buf = io.BytesIO()
-            image.save(buf, format="JPEG", quality=70)
-            b64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-
             # Chamada à LLM (resposta curta e direta, sem desculpas)
             payload = {
                 "model": Config.RAG_IMAGE_PROCESSOR_MODEL,
@@ -100,13 +209,17 @@ class ImageProcessor:
                 "temperature": 0.2,
             }
 
-            completion = self.client.chat.completions.create(**payload)
+            with openai_slot:
+                completion = self.client.chat.completions.create(**payload)
             raw = completion.choices[0].message.content
-            return self._sanitize_caption(raw)
+            description = self._sanitize_caption(raw)
+            if cache:
+                cache.set(cache_keys, description)
+            return description
 
         except requests.exceptions.RequestException as e:
-            print(f"    ❌ Erro de rede ao processar imagem {image_url}: {e}")
+            logger.error("    ❌ Erro de rede ao processar imagem %s: %s", image_url, e)
             return None
         except Exception as e:
-            print(f"    ❌ Erro ao processar imagem {image_url}: {e}")
+            logger.error("    ❌ Erro ao processar imagem %s: %s", image_url, e)
             return None
@@ -0,0 +1,105 @@
+import atexit
+import hashlib
+import json
+import os
+import shelve
+import threading
+from collections import OrderedDict
+from config.settings import Config
+from src.utils.openai_client import openai_slot
+
+class LLMCache:
+    """
+    Cache das respostas de texto do LLM, indexado pelo hash dos parâmetros da
+    chamada (modelo, mensagens, temperatura, max_tokens...).
+
+    Prompts idênticos na mesma execução (artigos duplicados entre coleções,
+    chunks repetidos) reaproveitam a resposta em memória (LRU de até
+    LLM_CACHE_SIZE entradas). Com LLM_CACHE_PATH definido, as respostas também
+    ficam gravadas em disco (shelve) e valem entre execuções.
+    """
+
+    def __init__(self, path: str = None, max_entries: int = None):
+        self.max_entries = Config.LLM_CACHE_SIZE if max_entries is None else max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        path = path or Config.LLM_CACHE_PATH
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = shelve.open(path)
+
+    @staticmethod
+    def make_key(params: dict) -> str:
+        """Gera a chave estável de uma chamada a partir dos seus parâmetros."""
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+                return content
+            if self._db is not None:
+                content = self._db.get(key)
+                if content is not None:
+                    self._remember(key, content)
+            return content
+
+    def set(self, key: str, content: str) -> None:
+        with self._lock:
+            self._remember(key, content)
+            if self._db is not None:
+                self._db[key] = content
+
+    def _remember(self, key: str, content: str) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = content
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def close(self) -> None:
+        """Grava pendências e fecha o arquivo do cache (se houver)."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Retorna o cache compartilhado do processo, criado no primeiro uso."""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+            atexit.register(_llm_cache.close)
+        return _llm_cache
+
+
+def cached_completion(client, **params) -> str | None:
+    """
+    Executa client.chat.completions.create(**params) sob o semáforo da OpenAI
+    e devolve o texto da resposta, reaproveitando respostas de chamadas
+    idênticas. Apenas respostas bem-sucedidas são guardadas.
+    """
+    cache = get_llm_cache()
+    key = cache.make_key(params)
+    content = cache.get(key)
+    if content is not None:
+        return content
+
+    with openai_slot:
+        response = client.chat.completions.create(**params)
+    content = response.choices[0].message.content
+    if content is not None:
+        cache.set(key, content)
+    return content
@@ -1,51 +1,73 @@
+import html
+import logging
 import re
 from bs4 import BeautifulSoup
 import html2text
+from config.settings import Config
+from src.utils.text_cleaner import _EMOJI_RANGES
 from .image_processor import ImageProcessor
 
+try:
+    import lxml  # noqa: F401 - parser em C do BeautifulSoup, bem mais rápido
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+try:
+    import html2text_rs  # Opcional: conversor HTML → Markdown em Rust
+except ImportError:
+    html2text_rs = None
+
+logger = logging.getLogger(__name__)
+
+# Padrões do _clean_visual_noise_only, compilados uma única vez.
+# Linhas decorativas (réguas visuais como *** --- ___) e emojis (ruído visual
+# para tutoriais técnicos) são removidos na mesma varredura: as alternativas
+# nunca se sobrepõem, então o resultado é o mesmo de duas passadas. As faixas
+# de emoji são as mesmas do TextCleaner (só os blocos de emoji, preservando
+# CJK, símbolos matemáticos etc.).
+_VISUAL_NOISE_RE = re.compile(
+    r'^\s*(?:\* ?\* ?\*|\*{3,}|-{3,}|_{3,})\s*$'
+    "|[" + _EMOJI_RANGES + "]+",
+    re.MULTILINE | re.UNICODE
+)
+# Toda linha decorativa contém um destes trechos (e emojis só existem fora do
+# ASCII); sem nenhum deles, _VISUAL_NOISE_RE não tem o que remover
+_DECORATIVE_MARKERS = ("**", "* *", "---", "___")
+# 3+ quebras de linha
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+# Presença de alguma tag <img> (decide se a árvore HTML precisa ser montada)
+_IMG_TAG_RE = re.compile(r'<img\b', re.IGNORECASE)
+# Tags <img> completas e headings (substituição textual das imagens)
+_IMG_RE = re.compile(r'<img\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>', re.IGNORECASE)
+_HEADING_RE = re.compile(r'<h([1-6])\b.*?</h\1\s*>', re.IGNORECASE | re.DOTALL)
+
 class TextProcessor:
     """
     Processa HTML em Markdown formatado, preservando estrutura semântica.
     Remove apenas ruídos visuais, mantendo formatação útil para chunking e contextual enrichment.
     """
     
-    def __init__(self):
-        self.image_processor = ImageProcessor()
+    def __init__(self, image_cache=None):
+        self.image_processor = ImageProcessor(cache=image_cache)
+        self.use_rust_converter = Config.HTML_TO_MARKDOWN == "html2text_rs"
+        if self.use_rust_converter and html2text_rs is None:
+            logger.warning("⚠️ HTML_TO_MARKDOWN=html2text_rs, mas html2text_rs não está instalado. Usando html2text.")
+            self.use_rust_converter = False
 
     def _clean_visual_noise_only(self, md: str) -> str:
         """
         Remove APENAS ruídos visuais, preservando formatação semântica.
         Esta é a diferença chave: não remove headings, bold, listas, etc.
         """
-        # Remove linhas decorativas (réguas visuais como *** --- ___)
-        md = re.sub(r'^\s*(\* ?\* ?\*|\*{3,}|-{3,}|_{3,})\s*$', '', md, flags=re.MULTILINE)
-        
-        # Remove emojis (ruído visual para tutoriais técnicos)
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # símbolos & pictogramas
-            "\U0001F680-\U0001F6FF"  # transportes & mapas
-            "\U0001F1E0-\U0001F1FF"  # bandeiras
-            "\U00002500-\U00002BEF"
-            "\U00002702-\U000027B0"
-            "\U000024C2-\U0001F251"
-            "\U0001f926-\U0001f937"
-            "\U00010000-\U0010ffff"
-            "\u2640-\u2642"
-            "\u2600-\u2B55"
-            "\u200d"
-            "\u23cf"
-            "\u23e9"
-            "\u231a"
-            "\ufe0f"
-            "\u3030"
-            "]+", re.UNICODE
-        )
-        md = emoji_pattern.sub('', md)
+        # Remove linhas decorativas (réguas visuais como *** --- ___) e emojis
+        # (ruído visual para tutoriais técnicos)
+        if not md.isascii() or any(marker in md for marker in _DECORATIVE_MARKERS):
+            md = _VISUAL_NOISE_RE.sub('', md)
         
         # Compacta quebras excessivas (3+ quebras → 2)
-        md = re.sub(r'\n{3,}', '\n\n', md)
+        if '\n\n\n' in md:
+            md = _EXCESS_NEWLINES_RE.sub('\n\n', md)
         
         # ✅ PRESERVA intencionalmente:
         # - Headings (# ## ### etc.)
@@ -83,35 +105,31 @@ class TextProcessor:
         if not html_body:
             return ""
 
-        soup = BeautifulSoup(html_body, 'html.parser')
+        # Etapa 1: Processa imagens (só monta a árvore HTML se houver alguma)
+        if _IMG_TAG_RE.search(html_body):
+            html_body = self._replace_images(html_body)
 
-        # Etapa 1: Processa imagens
-        for img in soup.find_all('img'):
-            url = img.get('src')
-            if not url:
-                img.decompose()
-                continue
-
-            print(f"  -> Processando imagem: {url[:50]}...")
+        # O html2text converte a entidade &nbsp; em \xa0 (e o caractere em espaço)
+        html_body = html_body.replace('&nbsp;', '\xa0')
 
-            # Imagens dentro de headings são decorativas
-            if img.find_parent(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                img.decompose()
-                continue
+        # Etapa 2: Converte HTML para Markdown PRESERVANDO formatação
+        md = self._html_to_markdown(html_body)
 
-            # Usa alt text curto quando disponível; senão GPT-4o
-            desc = self._maybe_use_alt(img) or self.image_processor.describe_image(url)
+        # Etapa 3: Remove APENAS ruídos visuais (preserva formatação semântica)
+        md = self._clean_visual_noise_only(md)
 
-            if not desc:
-                print(f"    -> Imagem removida (sem descrição útil)")
-                img.decompose()
-                continue
+        return md.strip()
 
-            # Injeta descrição inline, sem quebras extras
-            replacement = soup.new_string(f"[Descrição da Imagem: {desc}]")
-            img.replace_with(replacement)
+    def _html_to_markdown(self, html_body: str) -> str:
+        """
+        Converte HTML em Markdown com o html2text (padrão) ou, com
+        HTML_TO_MARKDOWN=html2text_rs, com o conversor em Rust, bem mais rápido.
+        O html2text_rs gera links no estilo referência e tabelas desenhadas, por
+        isso não é o padrão.
+        """
+        if self.use_rust_converter:
+            return html2text_rs.text_markdown(html_body, width=2**31 - 1)  # Sem quebras forçadas de linha
 
-        # Etapa 2: Converte HTML para Markdown PRESERVANDO formatação
         h = html2text.HTML2Text()
         h.body_width = 0           # Sem quebras forçadas de linha
         h.protect_links = True     # ✅ Preserva links intactos
@@ -119,9 +137,58 @@ class TextProcessor:
         h.unicode_snob = True      # ✅ Preserva caracteres Unicode (acentos)
         h.escape_snob = True       # ✅ Evita escaping desnecessário
         
-        md = h.handle(str(soup))
+        return h.handle(html_body)
 
-        # Etapa 3: Remove APENAS ruídos visuais (preserva formatação semântica)
-        md = self._clean_visual_noise_only(md)
+    def _replace_images(self, html_body: str) -> str:
+        """
+        Substitui cada imagem por uma descrição concisa (ou a remove) e devolve
+        o HTML resultante.
+
+        A troca é textual, tag a tag: só as tags <img> passam pelo
+        BeautifulSoup (para ler src/alt), sem montar e serializar a árvore do
+        artigo inteiro antes do html2text.
+        """
+        # Trechos dentro de headings: imagens ali são decorativas
+        heading_spans = [m.span() for m in _HEADING_RE.finditer(html_body)]
+
+        images = []
+        for match in _IMG_RE.finditer(html_body):
+            img = BeautifulSoup(match.group(0), _HTML_PARSER).find('img')
+            url = img.get('src') if img else None
+            if not url:
+                images.append((match, None, None))
+                continue
+
+            logger.debug("  -> Processando imagem: %s...", url[:50])
+
+            if any(start <= match.start() < end for start, end in heading_spans):
+                images.append((match, None, None))
+                continue
+
+            images.append((match, url, self._maybe_use_alt(img)))
+
+        # Usa alt text curto quando disponível; senão GPT-4o (todas as imagens
+        # sem alt do artigo são descritas em paralelo)
+        described = iter(self.image_processor.describe_images(
+            [url for _, url, alt in images if url and not alt]
+        ))
+
+        parts = []
+        last_end = 0
+        for match, url, alt in images:
+            parts.append(html_body[last_end:match.start()])
+            last_end = match.end()
+            if not url:
+                continue
+
+            desc = alt or next(described)
+
+            if not desc:
+                logger.debug("    -> Imagem removida (sem descrição útil)")
+                continue
+
+            # Injeta descrição inline, sem quebras extras
+            parts.append(html.escape(f"[Descrição da Imagem: {desc}]", quote=False))
+        parts.append(html_body[last_end:])
 
-        return md.strip()
\ No newline at end of file
+        return "".join(parts)
@@ -1,21 +1,162 @@
-from openai import OpenAI
+import atexit
+import hashlib
+import logging
+import os
+import shelve
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from openai import BadRequestError
 from config.settings import Config
+from src.utils.openai_client import get_openai_client, openai_slot
+
+logger = logging.getLogger(__name__)
+
+def quantize_int8(embedding: list) -> tuple[list, float]:
+    """
+    Quantiza o embedding para int8 com escala linear pelo maior valor absoluto.
+    Retorna (valores em [-127, 127], escala), com valor original ≈ int8 * escala.
+    """
+    max_abs = max(abs(value) for value in embedding) or 1.0
+    factor = 127 / max_abs
+    return [round(value * factor) for value in embedding], max_abs / 127
+
+
+def dequantize_int8(values: list, scale: float) -> list:
+    """Reconstrói (aproximadamente) o embedding em float a partir de quantize_int8."""
+    return [value * scale for value in values]
 
 class EmbeddingGenerator:
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = get_openai_client()
         self.model = Config.EMBEDDING_MODEL
         self.dimensions = Config.EMBEDDING_DIMENSIONS
+        # Cache LRU de embeddings por hash do texto (trechos repetidos entre
+        # artigos não voltam à API); compartilhado entre threads. Com
+        # EMBEDDING_CACHE_PATH definido, também fica gravado em disco (shelve)
+        # e vale entre execuções.
+        self.cache_size = Config.EMBEDDING_CACHE_SIZE
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_db = None
+        if Config.EMBEDDING_CACHE_PATH:
+            directory = os.path.dirname(Config.EMBEDDING_CACHE_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._cache_db = shelve.open(Config.EMBEDDING_CACHE_PATH)
+            atexit.register(self.close)
+    
+    def _text_key(self, text: str) -> str:
+        """Chave do cache: hash do texto + modelo + dimensões do embedding."""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{digest}:{self.model}:{self.dimensions}"
+
+    def _cache_get(self, keys) -> dict:
+        """Embeddings já conhecidos para as chaves (memória, depois disco)."""
+        found = {}
+        with self._cache_lock:
+            for key in keys:
+                if key in found:
+                    continue
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    found[key] = self._cache[key]
+                elif self._cache_db is not None and key in self._cache_db:
+                    found[key] = self._cache_db[key]
+                    self._remember(key, found[key])
+        return found
+
+    def _cache_set(self, items) -> None:
+        """Guarda os pares (chave, embedding); falhas (lista vazia) não entram no cache."""
+        with self._cache_lock:
+            for key, embedding in items:
+                if not embedding:
+                    continue
+                self._remember(key, embedding)
+                if self._cache_db is not None:
+                    self._cache_db[key] = embedding
+
+    def _remember(self, key: str, embedding: list) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def close(self) -> None:
+        """Grava pendências e fecha o cache em disco (se houver)."""
+        with self._cache_lock:
+            if self._cache_db is not None:
+                self._cache_db.close()
+                self._cache_db = None
     
     def generate(self, text: str) -> list:
-        """Gera embedding para um texto"""
+        """Gera embedding para um texto (lote de um item; lista vazia se falhar)"""
+        return self.generate_batch([text])[0]
+
+    def _embed_batch(self, batch: list, batch_number: int) -> list:
+        """Gera os embeddings de um lote; lista vazia por texto se o lote falhar."""
         try:
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=text,
-                dimensions=self.dimensions
-            )
-            return response.data[0].embedding
+            with openai_slot:
+                response = self.client.embeddings.create(
+                    model=self.model,
+                    input=batch,
+                    dimensions=self.dimensions
+                )
+            ordered = sorted(response.data, key=lambda item: item.index)
+            return [item.embedding for item in ordered]
+        except BadRequestError as e:
+            # Erros transitórios (429/5xx) já foram repetidos pelo SDK; um 400
+            # costuma vir de um único texto inválido (ex.: acima do limite de
+            # tokens), então o lote é dividido para não perder os demais
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                return self._embed_batch(batch[:middle], batch_number) + self._embed_batch(batch[middle:], batch_number)
+            logger.error("Erro ao gerar embeddings do lote %s: %s", batch_number, e)
+            return [[] for _ in batch]
         except Exception as e:
-            print(f"Erro ao gerar embedding: {e}")
-            return []
\ No newline at end of file
+            logger.error("Erro ao gerar embeddings do lote %s: %s", batch_number, e)
+            return [[] for _ in batch]
+
+    def generate_batch(self, texts: list, batch_size: int = 256, max_inflight: int = None) -> list:
+        """
+        Gera embeddings para vários textos com uma chamada à API por lote.
+        Lotes distintos são enviados em paralelo (até max_inflight requisições
+        simultâneas), sobrepondo a latência de rede.
+        
+        Args:
+            texts (list): Textos para gerar embedding
+            batch_size (int): Máximo de textos por requisição (a API aceita até 2048)
+            max_inflight (int): Máximo de lotes em andamento ao mesmo tempo
+                (padrão: OPENAI_MAX_CONCURRENCY)
+            
+        Returns:
+            list: Embeddings na mesma ordem dos textos; lista vazia para os
+            textos cujo lote falhou
+        """
+        # Textos repetidos (na chamada ou já vistos) são enviados uma única vez
+        keys = [self._text_key(text) for text in texts]
+        found = self._cache_get(keys)
+        to_embed = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in to_embed:
+                to_embed[key] = text
+
+        missing_keys = list(to_embed)
+        missing_texts = list(to_embed.values())
+        if max_inflight is None:
+            max_inflight = Config.OPENAI_MAX_CONCURRENCY
+        batches = [missing_texts[start:start + batch_size] for start in range(0, len(missing_texts), batch_size)]
+        if len(batches) <= 1 or max_inflight <= 1:
+            results = [self._embed_batch(batch, n) for n, batch in enumerate(batches, 1)]
+        else:
+            # executor.map preserva a ordem dos lotes
+            with ThreadPoolExecutor(max_workers=min(max_inflight, len(batches))) as executor:
+                results = list(executor.map(self._embed_batch, batches, range(1, len(batches) + 1)))
+        new_embeddings = [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
+        found.update(zip(missing_keys, new_embeddings))
+        self._cache_set(zip(missing_keys, new_embeddings))
+
+        return [found[key] for key in keys]
@@ -0,0 +1,64 @@
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.settings import Config
+
+try:
+    import orjson  # Opcional: parse mais rápido das respostas JSON
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache  # Opcional: cache em disco das respostas GET
+except ImportError:
+    requests_cache = None
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_session(pool_maxsize: int = 20) -> requests.Session:
+    """
+    Cria a sessão HTTP usada pelos clientes de API (Intercom, Kyte) e pelo
+    download de imagens.
+
+    A sessão reaproveita conexões (keep-alive) e repete respostas 429/5xx e
+    falhas de conexão com back-off exponencial, respeitando o Retry-After.
+    pool_maxsize é também o limite de requisições simultâneas por host: com o
+    pool cheio, as threads excedentes esperam uma conexão livre em vez de abrir
+    novas (e disparar 429).
+
+    Com HTTP_CACHE_PATH definido e o requests-cache instalado, as respostas
+    GET ficam em cache local por HTTP_CACHE_EXPIRE_SECONDS, o que torna
+    reexecuções do pipeline quase instantâneas na etapa de busca.
+    """
+    if Config.HTTP_CACHE_PATH and requests_cache is not None:
+        session = requests_cache.CachedSession(
+            Config.HTTP_CACHE_PATH,
+            backend="sqlite",
+            expire_after=Config.HTTP_CACHE_EXPIRE_SECONDS,
+            allowable_methods=("GET",),
+        )
+    else:
+        if Config.HTTP_CACHE_PATH:
+            logger.warning("⚠️ HTTP_CACHE_PATH definido, mas requests-cache não está instalado. Seguindo sem cache.")
+        session = requests.Session()
+
+    retries = Retry(total=Config.HTTP_MAX_RETRIES, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize,
+                                          pool_block=True, max_retries=retries))
+    return session
+
+
+def parse_json(response: requests.Response):
+    """
+    Decodifica o corpo JSON da resposta direto dos bytes (orjson, se instalado;
+    senão response.json()). Erros de parse chegam como
+    requests.exceptions.JSONDecodeError, tratados junto dos demais erros de rede.
+    """
+    if orjson is None:
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
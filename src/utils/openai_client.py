@@ -0,0 +1,37 @@
+import threading
+from openai import OpenAI
+from config.settings import Config
+
+# Semáforo compartilhado por todos os componentes: limita as chamadas
+# simultâneas à OpenAI feitas pelas threads do pipeline (limite de RPM do tier)
+openai_slot = threading.BoundedSemaphore(Config.OPENAI_MAX_CONCURRENCY)
+
+
+def create_openai_client() -> OpenAI:
+    """
+    Cria o cliente OpenAI usado pelos componentes do pipeline.
+
+    Respostas 429/5xx e erros de conexão são repetidos pelo próprio SDK com
+    back-off exponencial (respeitando o cabeçalho Retry-After) antes de a
+    exceção chegar ao componente.
+    """
+    return OpenAI(api_key=Config.OPENAI_API_KEY, max_retries=Config.OPENAI_MAX_RETRIES)
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Retorna o cliente OpenAI compartilhado do processo, criado no primeiro uso.
+
+    Todos os componentes usam o mesmo cliente (e o mesmo pool de conexões
+    HTTP), então as conexões keep-alive abertas por um componente são
+    reaproveitadas pelos demais, sem novo handshake TLS por componente.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = create_openai_client()
+        return _shared_client
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import shelve
+import threading
+import time
+from config.settings import Config
+
+class PipelineCache:
+    """
+    Cache local (shelve) dos resultados caros por tradução de artigo:
+    markdown, categoria e chunks enriquecidos.
+
+    A chave é o hash do idioma + HTML do corpo; o registro só é reutilizado se
+    o updated_at do artigo for o mesmo da execução que o gravou. Acesso
+    serializado por lock, pois o pipeline processa artigos em threads.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.PIPELINE_CACHE_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = shelve.open(self.path)
+
+    @staticmethod
+    def make_key(lang: str, html_body: str) -> str:
+        """Gera a chave do cache a partir do idioma e do HTML do corpo."""
+        return hashlib.sha256(f"{lang}\0{html_body}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str, updated_at) -> dict | None:
+        """Retorna o resultado em cache, ou None se ausente ou desatualizado."""
+        with self._lock:
+            entry = self._db.get(key)
+        if entry and entry.get("updated_at") == updated_at:
+            return entry
+        return None
+
+    def set(self, key: str, updated_at, markdown_text: str, category: str, enriched_chunks: list) -> None:
+        """Grava o resultado de uma tradução processada."""
+        with self._lock:
+            self._db[key] = {
+                "updated_at": updated_at,
+                "markdown_text": markdown_text,
+                "category": category,
+                "enriched_chunks": enriched_chunks,
+            }
+
+    def close(self) -> None:
+        """Grava pendências e fecha o arquivo do cache."""
+        with self._lock:
+            self._db.close()
+
+
+class ImageDescriptionCache:
+    """
+    Cache local (shelve) das descrições de imagens geradas pelo modelo de visão.
+
+    Cada descrição é gravada sob a URL e sob o hash SHA-256 do conteúdo, para
+    que a mesma captura de tela em outra URL também seja reaproveitada. Imagens
+    descartadas (ícones, animadas, recusas do modelo) são gravadas como None,
+    evitando novas tentativas. Os registros expiram após IMAGE_CACHE_TTL_DAYS.
+
+    Sem caminho (IMAGE_CACHE_PATH vazio), o cache fica só em memória e vale
+    para a execução atual: imagens repetidas entre artigos e traduções são
+    descritas uma única vez.
+    """
+
+    def __init__(self, path: str = None, ttl_days: int = None):
+        self.path = path or Config.IMAGE_CACHE_PATH
+        self.ttl_seconds = (ttl_days if ttl_days is not None else Config.IMAGE_CACHE_TTL_DAYS) * 86400
+        self._lock = threading.Lock()
+        if not self.path:
+            self._db = {}
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = shelve.open(self.path)
+
+    @staticmethod
+    def url_key(image_url: str) -> str:
+        return f"url:{image_url}"
+
+    @staticmethod
+    def content_key(content: bytes) -> str:
+        return f"sha256:{hashlib.sha256(content).hexdigest()}"
+
+    def get(self, key: str) -> tuple[bool, str | None]:
+        """Retorna (encontrado, descrição); registros expirados contam como ausentes."""
+        with self._lock:
+            entry = self._db.get(key)
+        if entry and entry["expires_at"] > time.time():
+            return True, entry["description"]
+        return False, None
+
+    def set(self, keys: list, description: str | None) -> None:
+        """Grava a descrição (ou None para imagens descartadas) sob cada chave."""
+        entry = {"description": description, "expires_at": time.time() + self.ttl_seconds}
+        with self._lock:
+            for key in keys:
+                self._db[key] = entry
+
+    def close(self) -> None:
+        """Grava pendências e fecha o arquivo do cache (se houver)."""
+        with self._lock:
+            if self.path:
+                self._db.close()
@@ -1,5 +1,123 @@
 import re
 import unicodedata
+from functools import lru_cache
+
+# Faixas de emojis e pictogramas, disjuntas e restritas aos blocos de emoji.
+# As antigas faixas \u24C2-\U0001F251 e \U00010000-\U0010FFFF engoliam
+# também caracteres CJK, braille, símbolos matemáticos etc.
+_EMOJI_RANGES = (
+    "\U0001F000-\U0001FAFF"  # emoticons, pictogramas, transportes, bandeiras, símbolos suplementares
+    "\U000E0020-\U000E007F"  # tags de bandeiras regionais
+    "\u2600-\u27BF"          # símbolos diversos & dingbats
+    "\u2B05-\u2B55"          # setas e formas usadas como emoji
+    "\u231A\u231B\u23CF\u23E9-\u23F3\u23F8-\u23FA"
+    "\u25AA\u25AB\u25B6\u25C0\u25FB-\u25FE"
+    "\u24C2\u2934\u2935\u3030\u303D\u3297\u3299"
+    "\u200D\uFE0F\u20E3"     # ZWJ, seletor de variação e keycap
+)
+
+_EMOJI_RE = re.compile("[" + _EMOJI_RANGES + "]+", re.UNICODE)
+
+# Caracteres de controle problemáticos e tokens invisíveis, removidos com
+# str.translate (uma única passada em C, sem motor de regex)
+_INVISIBLE_CHARS = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F,
+     0x200B, 0x200C, 0x200D, 0xFEFF]
+)
+
+# Limpeza estrutural para embeddings: (gatilhos, padrão, substituição),
+# aplicados na ordem original. As passadas são sequenciais de propósito (cada
+# uma vê o resultado da anterior, p.ex. o itálico só depois do negrito); cada
+# uma só roda se algum gatilho aparecer no texto (busca de substring em C).
+_MARKUP_PASSES = (
+    (("<",), re.compile(r"<[^>]+>"), " "),                                    # tags HTML
+    (("```",), re.compile(r"```.+?```", re.DOTALL), " "),                     # code blocks
+    (("`",), re.compile(r"`([^`]+)`"), r"\1"),                                # inline code
+    (("#",), re.compile(r"(?m)^\s{0,3}#{1,6}\s*"), ""),                       # headers
+    (("**",), re.compile(r"\*\*([^*]+)\*\*"), r"\1"),                         # bold
+    (("__",), re.compile(r"__([^_]+)__"), r"\1"),                             # bold alt
+    (("*",), re.compile(r"\*([^*]+)\*"), r"\1"),                              # itálico
+    (("_",), re.compile(r"_([^_]+)_"), r"\1"),                                # itálico alt
+    (("](",), re.compile(r"\[([^\]]+)\]\([^)]+\)"), r"\1"),                   # links
+    (("-", "*", "_"), re.compile(r"(?m)^\s{0,3}[-*_]{3,}\s*$"), " "),         # horizontal rules
+    (("*",), re.compile(r"(?m)^\s*\*\s*$"), ""),                              # linha com só *
+    (("*", "•"), re.compile(r"(?m)^\s*[\*\•]\s+"), "- "),                     # bullets → -
+)
+
+# Indicadores de HTML/markdown, testados em uma única busca
+_FORMAT_HINT_RE = re.compile(
+    r"<[^>]+>"                   # tags HTML
+    r"|```.*?```"                # code blocks
+    r"|`[^`]+`"                  # inline code
+    r"|\*\*[^*]+\*\*"            # bold
+    r"|__[^_]+__"                # bold alt
+    r"|^\s{0,3}#{1,6}\s"         # headings
+    r"|\[[^\]]+\]\([^)]+\)"      # links
+    r"|^\s{0,3}[-*_]{3,}",       # horizontal rules
+    re.MULTILINE | re.DOTALL,
+)
+# Toda alternativa de _FORMAT_HINT_RE exige ao menos um destes caracteres
+_FORMAT_HINT_CHARS = "<`*_#[-"
+
+# Normalização de espaços (preserva quebras semânticas). Um espaço simples já
+# está normalizado, então só casa sequências ou outros espaços horizontais
+# (tab, nbsp...), evitando uma substituição por palavra do texto.
+_WS_RE = re.compile(r"[^\S\r\n]{2,}|[^\S \r\n]")
+_MULTI_NL_RE = re.compile(r"\n{3,}")  # só aplicada se houver "\n\n\n" (busca de substring em C)
+
+# Comparação de linhas com os headings de aprendizado
+_HEADING_PREFIX_RE = re.compile(r"^\s{0,3}(?:\#{1,6}\s*)?")
+_LEADING_BOLD_RE = re.compile(r"^\s*(?:\*\*|__)\s*")
+_TRAILING_BOLD_RE = re.compile(r"\s*(?:\*\*|__)\s*$")
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+_HR_LINE_RE = re.compile(r"(?m)^\s*(?:[-_*]\s*){3,}\s*$")
+
+_LEARNING_PHRASES = frozenset({
+    "what youll learn",
+    "what you will learn",
+    "o que voce vai aprender",
+    "lo que vas a aprender",
+})
+
+# Palavras presentes em todas as _LEARNING_PHRASES (triagem antes da varredura por linha)
+_LEARNING_KEYWORDS = ("learn", "aprender")
+# Separadores de linha do str.splitlines() além de "\n"
+_OTHER_LINE_BREAKS_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# Caracteres que indicam possível marcação para _MARKUP_PASSES
+_MARKUP_TRIGGERS = ("<", "`", "#", "*", "_", "[", "---", "•")
+
+
+class _FoldTable(dict):
+    """
+    Tabela do str.translate para _ascii_fold, preenchida sob demanda: cada
+    caractere é decomposto (NFKD, sem marcas combinantes) uma única vez e o
+    resultado fica memorizado para as próximas linhas.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        decomposed = unicodedata.normalize('NFKD', chr(codepoint))
+        folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+        folded = folded.replace("\u2019", "'").replace("\u201c", '"').replace("\u201d", '"')
+        self[codepoint] = folded
+        return folded
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def _has_markup_candidates(text: str) -> bool:
+    """Indica se há emojis ou marcação a remover no texto (teste barato, em C)."""
+    return not text.isascii() or any(t in text for t in _MARKUP_TRIGGERS)
+
+
+def _strip_markup(text: str) -> str:
+    """Remove HTML e estrutura markdown preservando o conteúdo."""
+    for triggers, pattern, replacement in _MARKUP_PASSES:
+        if any(t in text for t in triggers):
+            text = pattern.sub(replacement, text)
+    return text
+
 
 class TextCleaner:
     """
@@ -9,49 +127,6 @@ class TextCleaner:
     - Remove apenas ruídos visuais para embeddings
     """
     
-    def __init__(self):
-        # Padrões de emojis e pictogramas
-        self.emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # símbolos & pictogramas
-            "\U0001F680-\U0001F6FF"  # transportes & mapas
-            "\U0001F1E0-\U0001F1FF"  # bandeiras
-            "\U00002702-\U000027B0"
-            "\U000024C2-\U0001F251"
-            "\U0001f926-\U0001f937"
-            "\U00010000-\U0010ffff"
-            "\u2640-\u2642"
-            "\u2600-\u2B55"
-            "\u200d"
-            "\u23cf"
-            "\u23e9"
-            "\u231a"
-            "\ufe0f"
-            "\u3030"
-            "]+", flags=re.UNICODE
-        )
-        
-        # Caracteres de controle problemáticos
-        self.control_chars_pattern = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]")
-        
-        # Tags HTML
-        self.html_tags_pattern = re.compile(r"<[^>]+>")
-        
-        # Tokens invisíveis
-        self.invisible_tokens_pattern = re.compile(r"(?:\u200b|\u200c|\u200d|\uFEFF)")
-        
-        # Padrões para detecção de markdown/HTML
-        self.markdown_indicators = [
-            re.compile(r"```.*?```", re.DOTALL),  # code blocks
-            re.compile(r"`[^`]+`"),                # inline code
-            re.compile(r"\*\*[^*]+\*\*"),         # bold
-            re.compile(r"__[^_]+__"),             # bold alt
-            re.compile(r"(?m)^\s{0,3}#{1,6}\s"),  # headings
-            re.compile(r"\[[^\]]+\]\([^)]+\)"),   # links
-            re.compile(r"(?m)^\s{0,3}[-*_]{3,}"), # horizontal rules
-        ]
-    
     def looks_like_markdown_or_html(self, text: str) -> bool:
         """
         Detecta se o texto contém marcações que precisam de limpeza estrutural.
@@ -62,16 +137,10 @@ class TextCleaner:
         Returns:
             bool: True se precisar de limpeza, False para normalização mínima
         """
-        # HTML tags
-        if self.html_tags_pattern.search(text):
-            return True
-            
-        # Indicadores de markdown
-        for pattern in self.markdown_indicators:
-            if pattern.search(text):
-                return True
-                
-        return False
+        # Atalho: sem nenhum caractere de marcação, a regex não tem o que encontrar
+        if not any(c in text for c in _FORMAT_HINT_CHARS):
+            return False
+        return _FORMAT_HINT_RE.search(text) is not None
     
     def minimal_normalize(self, text: str) -> str:
         """
@@ -84,15 +153,13 @@ class TextCleaner:
         Returns:
             str: Texto normalizado preservando semântica
         """
-        # Remove caracteres de controle
-        text = self.control_chars_pattern.sub("", text)
-        
-        # Remove tokens invisíveis
-        text = self.invisible_tokens_pattern.sub("", text)
+        # Remove caracteres de controle e tokens invisíveis
+        text = text.translate(_INVISIBLE_CHARS)
         
         # Normaliza espaços (preserva quebras semânticas)
-        text = re.sub(r"[^\S\r\n]+", " ", text)  # múltiplos espaços → 1
-        text = re.sub(r"\n{3,}", "\n\n", text)   # 3+ quebras → 2
+        text = _WS_RE.sub(" ", text)          # múltiplos espaços → 1
+        if "\n\n\n" in text:
+            text = _MULTI_NL_RE.sub("\n\n", text)  # 3+ quebras → 2
         
         return text.strip()
     
@@ -107,109 +174,64 @@ class TextCleaner:
         Returns:
             str: Texto limpo otimizado para embeddings
         """
-        # Remove emojis (ruído visual)
-        text = self.emoji_pattern.sub("", text)
-        
-        # Remove caracteres de controle
-        text = self.control_chars_pattern.sub("", text)
-        
-        # Remove tokens invisíveis
-        text = self.invisible_tokens_pattern.sub("", text)
-        
-        # Remove HTML tags
-        text = self.html_tags_pattern.sub(" ", text)
-        
-        # Remove estrutura markdown preservando conteúdo
-        text = self._strip_markdown_structure(text)
-        
-        # Remove headings tipo "What you'll learn"
-        text = self._remove_learning_headings(text)
-        
-        # Normaliza espaços
-        text = re.sub(r"[^\S\r\n]+", " ", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        
-        return text.strip()
-    
-    def _strip_markdown_structure(self, text: str) -> str:
-        """Remove estrutura markdown preservando conteúdo semântico."""
-        # Code blocks → remove completamente
-        text = re.sub(r"```.+?```", " ", text, flags=re.DOTALL)
-        
-        # Inline code → preserva conteúdo
-        text = re.sub(r"`([^`]+)`", r"\1", text)
-        
-        # Headers → remove marcadores #
-        text = re.sub(r"(?m)^\s{0,3}#{1,6}\s*", "", text)
-        
-        # Bold/italic → preserva conteúdo
-        text = re.sub(r"\*\*([^*]+)\*\*", r"\1", text)
-        text = re.sub(r"__([^_]+)__", r"\1", text)
-        text = re.sub(r"\*([^*]+)\*", r"\1", text)
-        text = re.sub(r"_([^_]+)_", r"\1", text)
-        
-        # Links [texto](url) → preserva texto
-        text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
-        
-        # Horizontal rules → remove
-        text = re.sub(r"(?m)^\s{0,3}[-*_]{3,}\s*$", " ", text)
-        text = re.sub(r"(?m)^\s*\*\s*$", "", text)  # linha com só *
-        
-        # Bullets → normaliza para -
-        text = re.sub(r"(?m)^\s*[\*\•]\s+", "- ", text)
-        
-        return text
+        return _clean_for_embeddings(text)
     
     def _ascii_fold(self, s: str) -> str:
         """Normalização Unicode para comparação"""
-        s = unicodedata.normalize('NFKD', s)
-        s = "".join(c for c in s if not unicodedata.combining(c))
-        return s.replace("'", "'").replace(""", '"').replace(""", '"')
+        if s.isascii():
+            return s
+        return s.translate(_FOLD_TABLE)
     
     def _normalize_line_for_compare(self, line: str) -> str:
         """Normaliza linha para comparação de headings"""
         # Remove marcadores de heading
-        line = re.sub(r"^\s{0,3}(?:\#{1,6}\s*)?", "", line)
-        line = re.sub(r"^\s*(?:\*\*|__)\s*", "", line)
-        line = re.sub(r"\s*(?:\*\*|__)\s*$", "", line)
+        line = _HEADING_PREFIX_RE.sub("", line)
+        line = _LEADING_BOLD_RE.sub("", line)
+        line = _TRAILING_BOLD_RE.sub("", line)
         
         # Normaliza para comparação
         line = self._ascii_fold(line).lower()
         line = line.replace("'", "")  # you'll → youll
-        line = re.sub(r"\s+", " ", line)
+        line = _WHITESPACE_RUN_RE.sub(" ", line)
         return line.strip(" :.-")
     
+    def _mentions_learning_keyword(self, text: str) -> bool:
+        """
+        Indica se o texto contém "learn"/"aprender" após a mesma dobra usada em
+        _normalize_line_for_compare (condição necessária para casar uma frase).
+        """
+        folded = text.lower() if text.isascii() else self._ascii_fold(text).lower()
+        if "'" in folded:
+            folded = folded.replace("'", "")
+        return any(k in folded for k in _LEARNING_KEYWORDS)
+
     def _remove_learning_headings(self, text: str) -> str:
         """
         Remove headings do tipo "What you'll learn / O que você vai aprender"
         """
-        learning_phrases = {
-            "what youll learn",
-            "what you will learn", 
-            "o que voce vai aprender",
-            "lo que vas a aprender",
-        }
-        
-        hr_pattern = re.compile(r"(?m)^\s*(?:[-_*]\s*){3,}\s*$")
-        
+        # Atalho: sem as palavras-chave não há heading a remover. Devolve o
+        # mesmo que splitlines() + join (só a quebra final é descartada).
+        if not self._mentions_learning_keyword(text) and not _OTHER_LINE_BREAKS_RE.search(text):
+            return text[:-1] if text.endswith("\n") else text
+
         lines = text.splitlines()
         keep = []
         i = 0
         
         while i < len(lines):
             raw = lines[i]
-            norm = self._normalize_line_for_compare(raw)
             
-            if norm in learning_phrases:
+            # Só normaliza (regex + dobra Unicode) linhas com alguma palavra-chave
+            if self._mentions_learning_keyword(raw) and self._normalize_line_for_compare(raw) in _LEARNING_PHRASES:
                 # Remove linha anterior se for régua/vazia
-                if keep and (hr_pattern.match(keep[-1]) or keep[-1].strip() == ""):
+                if keep and (_HR_LINE_RE.match(keep[-1]) or keep[-1].strip() == ""):
                     keep.pop()
                 
                 # Pula a linha do heading
                 i += 1
                 
                 # Pula linhas vazias/régua subsequentes
-                while i < len(lines) and (lines[i].strip() == "" or hr_pattern.match(lines[i])):
+                while i < len(lines) and (lines[i].strip() == "" or _HR_LINE_RE.match(lines[i])):
                     i += 1
                 continue
                 
@@ -230,12 +252,15 @@ class TextCleaner:
             str: Chunk limpo otimizado para embeddings
         """
         # Extrai contexto se existir (formato do ContextualEnricher)
-        context_match = re.match(r'^(Contexto:.*?)\n---\n(.*)', 
-                                contextualized_content, re.DOTALL)
+        # ("Contexto: ...\n---\n<chunk>"; separa no primeiro marcador)
+        if contextualized_content.startswith("Contexto:"):
+            context_part, separator, main_content = contextualized_content.partition("\n---\n")
+        else:
+            separator = ""
         
-        if context_match:
-            context_part = context_match.group(1).strip()
-            main_content = context_match.group(2).strip()
+        if separator:
+            context_part = context_part.strip()
+            main_content = main_content.strip()
             
             # Remove headings de aprendizado do conteúdo principal
             main_content = self._remove_learning_headings(main_content)
@@ -255,4 +280,41 @@ class TextCleaner:
         if self.looks_like_markdown_or_html(content):
             return self.clean_for_embeddings(content)
         else:
-            return self.minimal_normalize(content)
\ No newline at end of file
+            return self.minimal_normalize(content)
+
+
+# TextCleaner não guarda estado: o resultado depende só do texto, então
+# trechos repetidos (ex.: o mesmo bloco de código ou tabela nas traduções de um
+# artigo) reaproveitam a limpeza já feita. O cache fica em nível de módulo,
+# indexado só pelo texto (sem prender instâncias de TextCleaner).
+_CLEANER = TextCleaner()
+
+
+@lru_cache(maxsize=1024)
+def _clean_for_embeddings(text: str) -> str:
+    """Implementação memorizada de TextCleaner.clean_for_embeddings."""
+    # Remove caracteres de controle e tokens invisíveis antes de tudo: \x0b,
+    # \x0c e \x1c-\x1e contam como quebra de linha para o splitlines() da
+    # remoção de headings
+    text = text.translate(_INVISIBLE_CHARS)
+    
+    # Atalho: texto ASCII sem marcação não tem emojis nem estrutura a remover
+    if not _has_markup_candidates(text):
+        return _CLEANER.minimal_normalize(_CLEANER._remove_learning_headings(text))
+    
+    # Remove emojis (ruído visual); só existem fora do ASCII
+    if not text.isascii():
+        text = _EMOJI_RE.sub("", text)
+    
+    # Remove HTML e estrutura markdown (preservando conteúdo)
+    text = _strip_markup(text)
+    
+    # Remove headings tipo "What you'll learn"
+    text = _CLEANER._remove_learning_headings(text)
+    
+    # Normaliza espaços
+    text = _WS_RE.sub(" ", text)
+    if "\n\n\n" in text:
+        text = _MULTI_NL_RE.sub("\n\n", text)
+    
+    return text.strip()
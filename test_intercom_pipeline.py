@@ -1,5 +1,10 @@
+import logging
 import sys
 import os
+import threading
+from collections.abc import Set as AbstractSet
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 # Adiciona o diretório raiz do projeto ao Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -13,14 +18,67 @@ from src.processing.contextual_enricher import ContextualEnricher
 from src.processing.categorizer import ArticleCategorizer
 from src.utils.embeddings import EmbeddingGenerator
 from src.utils.text_cleaner import TextCleaner  # ✅ Novo módulo unificado
+
+logger = logging.getLogger(__name__)
+
+class PipelineComponents:
+    """
+    Componentes do pipeline de teste, criados sob demanda no primeiro acesso:
+    o que o caminho de teste não usa não chega a ser construído (clientes da
+    OpenAI, cache de embeddings...). A criação é protegida por lock para que
+    workers paralelos não construam o mesmo componente duas vezes.
+    """
+
+    def __init__(self):
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory):
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = factory()
+            return self._instances[name]
+
+    @property
+    def intercom_client(self) -> IntercomClient:
+        return self._get("intercom_client", IntercomClient)
+
+    @property
+    def text_processor(self) -> TextProcessor:
+        return self._get("text_processor", TextProcessor)  # Agora preserva markdown
+
+    @property
+    def chunker(self) -> LLMChunker:
+        return self._get("chunker", LLMChunker)
+
+    @property
+    def enricher(self) -> ContextualEnricher:
+        return self._get("enricher", ContextualEnricher)
+
+    @property
+    def categorizer(self) -> ArticleCategorizer:
+        return self._get("categorizer", ArticleCategorizer)
+
+    @property
+    def embedding_generator(self) -> EmbeddingGenerator:
+        return self._get("embedding_generator", EmbeddingGenerator)
+
+    @property
+    def text_cleaner(self) -> TextCleaner:
+        return self._get("text_cleaner", TextCleaner)  # ✅ Novo componente unificado
+
+
+# Quantidade de artigos processados no modo teste
+TEST_ARTICLE_COUNT = 3
+
 # ✅ NOVA CONFIGURAÇÃO: IDs que devem ter todos os idiomas (PT, EN, ES)
-MULTILINGUAL_ARTICLE_IDS = [
+MULTILINGUAL_ARTICLE_IDS: frozenset[str] = frozenset({
     "7861149", "7915496", "8411647", "8887223", "7915619",
     "7861109", "10008263", "7885145", "7992438", "7914908"
-]
+})
 
 # Função igual ao pipeline principal
-def get_allowed_languages(article_id: str, multilingual_article_ids: list) -> list:
+def get_allowed_languages(article_id: str, multilingual_article_ids: AbstractSet[str]) -> list:
     """
     Determina quais idiomas processar baseado no ID do artigo.
     - Para IDs específicos: processa PT, EN, ES
@@ -32,164 +90,166 @@ def get_allowed_languages(article_id: str, multilingual_article_ids: list) -> li
         return ["pt", "pt-BR"]  # Aceita pt e pt-BR para os demais
 
 
-def is_rag_eligible_article(article: dict, rag_collection_id: str = None, excluded_article_ids: list = None) -> bool:
-    """Determina se um artigo é elegível para o RAG baseado na coleção e lista de exclusões."""
+def eligible_translations(article: dict, rag_collection_id: str = None, excluded_article_ids: AbstractSet[str] = frozenset()) -> list | None:
+    """
+    Determina se um artigo é elegível para o RAG baseado na coleção e exclusões.
+
+    Returns:
+        list | None: Pares (idioma, conteúdo) com corpo e estado válidos, ou None
+        se o artigo não for elegível.
+    """
     article_id = str(article.get("id", ""))
-    if excluded_article_ids and article_id in excluded_article_ids:
-        return False
+    if article_id in excluded_article_ids:
+        return None
     if rag_collection_id:
         parent_ids = article.get("parent_ids", [])
-        if rag_collection_id not in [str(pid) for pid in parent_ids]:
-            return False
-
-    translated_content = article.get("translated_content", {})
-    if not translated_content:
-        return False
+        if rag_collection_id not in map(str, parent_ids):
+            return None
 
-    for _, content in translated_content.items():
-        if isinstance(content, dict) and content.get("body"):
-            state = content.get("state", "")
-            if state == "published" or (state == "draft" and rag_collection_id):
-                return True
-    return False
+    # Rascunhos só entram quando o artigo vem da coleção RAG
+    eligible_states = ("published", "draft") if rag_collection_id else ("published",)
+    translations = [
+        (lang, content)
+        for lang, content in (article.get("translated_content") or {}).items()
+        if isinstance(content, dict) and content.get("body") and content.get("state") in eligible_states
+    ]
+    return translations or None
 
 
-def process_single_article_test(article: dict, components: dict, rag_collection_id: str = None, excluded_article_ids: list = None) -> list:
+def process_single_article_test(article: dict, components: PipelineComponents, rag_collection_id: str = None, excluded_article_ids: AbstractSet[str] = frozenset()) -> list:
     """
     Versão de teste que processa um artigo seguindo as melhores práticas
     mas NÃO salva no MongoDB. Mostra todo o pipeline em ação.
+
+    O relatório do artigo é acumulado em memória e registrado de uma vez ao
+    final: uma escrita por artigo em vez de dezenas, e sem misturar as linhas
+    de artigos processados em paralelo.
     """
+    output = []
+    try:
+        return _run_article_test(article, components, rag_collection_id, excluded_article_ids, output.append)
+    finally:
+        if output:
+            logger.info("\n".join(output))
+
+
+def _run_article_test(article: dict, components: PipelineComponents, rag_collection_id: str, excluded_article_ids: AbstractSet[str], emit) -> list:
+    """Executa o pipeline de teste de um artigo, enviando o relatório para emit."""
     article_id = article.get("id")
     documents_for_db = []
+    pending = []  # (documento, texto para embedding)
 
-    if not is_rag_eligible_article(article, rag_collection_id, excluded_article_ids):
-        if excluded_article_ids and str(article_id) in excluded_article_ids:
-            print(f" -> Artigo {article_id} pulado: está na lista de exclusões.")
+    translations = eligible_translations(article, rag_collection_id, excluded_article_ids)
+    if not translations:
+        if str(article_id) in excluded_article_ids:
+            emit(f" -> Artigo {article_id} pulado: está na lista de exclusões.")
         else:
-            print(f" -> Artigo {article_id} pulado: não está na coleção RAG ou não tem conteúdo válido.")
+            emit(f" -> Artigo {article_id} pulado: não está na coleção RAG ou não tem conteúdo válido.")
         return documents_for_db
 
 
     # Se for coleção RAG, processa todos os idiomas disponíveis
     if rag_collection_id:
         allowed_languages = list(article.get("translated_content", {}).keys())
-        print(f"📋 Artigo {article_id} (coleção RAG) - Todos idiomas permitidos: {allowed_languages}")
+        emit(f"📋 Artigo {article_id} (coleção RAG) - Todos idiomas permitidos: {allowed_languages}")
     else:
         allowed_languages = get_allowed_languages(article_id, MULTILINGUAL_ARTICLE_IDS)
-        print(f"📋 Artigo {article_id} - Idiomas permitidos: {allowed_languages}")
+        emit(f"📋 Artigo {article_id} - Idiomas permitidos: {allowed_languages}")
+    allowed_set = frozenset(allowed_languages)
 
-    for lang, content in article.get("translated_content", {}).items():
+    # translations já vem filtrado por corpo e estado; resta o filtro de idioma
+    for lang, content in translations:
         # Se for coleção RAG, não filtra idiomas
-        if not rag_collection_id and lang not in allowed_languages:
-            print(f" -> Idioma {lang} pulado para artigo {article_id} (não está na lista permitida)")
-            continue
-
-        if not (isinstance(content, dict) and content.get("body")):
+        if not rag_collection_id and lang not in allowed_set:
+            emit(f" -> Idioma {lang} pulado para artigo {article_id} (não está na lista permitida)")
             continue
 
         state = content.get("state", "")
-        if not (state == "published" or (state == "draft" and rag_collection_id)):
-            continue
-
-        print(f"\n📄 TESTANDO Artigo ID: {article_id}, Idioma: {lang}, Estado: {state}")
+        emit(f"\n📄 TESTANDO Artigo ID: {article_id}, Idioma: {lang}, Estado: {state}")
         title = content.get("title", "Sem título")
-        print(f"📝 Título: {title}")
+        emit(f"📝 Título: {title}")
 
         # ✅ ETAPA 1: HTML → Markdown formatado (preserva estrutura)
-        print("\n🔧 ETAPA 1: Convertendo HTML → Markdown formatado...")
+        emit("\n🔧 ETAPA 1: Convertendo HTML → Markdown formatado...")
         html_body = content["body"]
-        markdown_text = components["text_processor"].process_html_body(html_body)
+        markdown_text = components.text_processor.process_html_body(html_body)
         
         if not markdown_text:
-            print(" -> Artigo pulado pois não contém texto após o parsing.")
+            emit(" -> Artigo pulado pois não contém texto após o parsing.")
             continue
 
-        print(f"📏 Markdown gerado: {len(markdown_text)} chars")
-        print(f"🔤 Prévia do markdown (400 chars):")
-        print(f"{markdown_text[:400]}...")
-        print("=" * 50)
+        emit(f"📏 Markdown gerado: {len(markdown_text)} chars")
+        emit(f"🔤 Prévia do markdown (400 chars):")
+        emit(f"{markdown_text[:400]}...")
+        emit("=" * 50)
 
         # ✅ ETAPA 2: Categorização (usa markdown formatado)
-        print("\n🏷️  ETAPA 2: Categorizando com markdown formatado...")
-        category = components["categorizer"].categorize_article(markdown_text, title)
-        print(f"🏷️  Categoria identificada: {category}")
+        emit("\n🏷️  ETAPA 2: Categorizando com markdown formatado...")
+        category = components.categorizer.categorize_article(markdown_text, title)
+        emit(f"🏷️  Categoria identificada: {category}")
 
         # ✅ ETAPA 3: Chunking semântico (usa markdown formatado)
-        print("\n✂️  ETAPA 3: Chunking semântico com markdown...")
-        chunks = components["chunker"].chunk_text(markdown_text)
-        print(f"✂️  Gerados {len(chunks)} chunks semânticos")
+        emit("\n✂️  ETAPA 3: Chunking semântico com markdown...")
+        chunks = components.chunker.chunk_text(markdown_text)
+        emit(f"✂️  Gerados {len(chunks)} chunks semânticos")
         
         if chunks:
-            print(f"\n📋 EXEMPLO DE CHUNK SEMÂNTICO (bruto, com markdown):")
-            print(f"Tamanho: {len(chunks[0])} chars")
-            print(chunks[0][:500] + ("..." if len(chunks[0]) > 500 else ""))
-            print("-" * 70)
+            emit(f"\n📋 EXEMPLO DE CHUNK SEMÂNTICO (bruto, com markdown):")
+            emit(f"Tamanho: {len(chunks[0])} chars")
+            emit(chunks[0][:500] + ("..." if len(chunks[0]) > 500 else ""))
+            emit("-" * 70)
 
         # ✅ ETAPA 4: Enriquecimento contextual (usa markdown formatado)
 
-        print("\n🔧 ETAPA 4: Enriquecimento contextual...")
-        enriched_chunks = components["enricher"].enrich_chunks(chunks, markdown_text, language=lang)
-        print(f"🔧 Gerados e enriquecidos {len(enriched_chunks)} chunks finais")
+        emit("\n🔧 ETAPA 4: Enriquecimento contextual...")
+        enriched_chunks = components.enricher.enrich_chunks(chunks, markdown_text, language=lang)
+        emit(f"🔧 Gerados e enriquecidos {len(enriched_chunks)} chunks finais")
 
         # Mostra exemplo de chunk enriquecido (ainda com markdown)
         if enriched_chunks:
-            print(f"\n📋 EXEMPLO DE CHUNK ENRIQUECIDO (ainda com markdown):")
-            print(f"Tamanho: {len(enriched_chunks[0])} chars")
-            print(enriched_chunks[0][:600] + ("..." if len(enriched_chunks[0]) > 600 else ""))
-            print("-" * 70)
+            emit(f"\n📋 EXEMPLO DE CHUNK ENRIQUECIDO (ainda com markdown):")
+            emit(f"Tamanho: {len(enriched_chunks[0])} chars")
+            emit(enriched_chunks[0][:600] + ("..." if len(enriched_chunks[0]) > 600 else ""))
+            emit("-" * 70)
 
         # ✅ ETAPA 5: Limpeza condicional + Embeddings (APENAS agora limpa)
-        print(f"\n🧽 ETAPA 5: Limpeza condicional + Embeddings...")
-        text_cleaner = components["text_cleaner"]
+        emit(f"\n🧽 ETAPA 5: Limpeza condicional + Embeddings...")
+        text_cleaner = components.text_cleaner
         
         for i, contextualized_chunk in enumerate(enriched_chunks):
-            print(f"\n🧽 Processando chunk {i+1}/{len(enriched_chunks)}...")
+            emit(f"\n🧽 Processando chunk {i+1}/{len(enriched_chunks)}...")
             
             # Mostra estado antes da limpeza
-            print(f"📦 ANTES da limpeza (chunk {i+1}) — len={len(contextualized_chunk)}:")
-            print(contextualized_chunk[:300] + ("..." if len(contextualized_chunk) > 300 else ""))
+            emit(f"📦 ANTES da limpeza (chunk {i+1}) — len={len(contextualized_chunk)}:")
+            emit(contextualized_chunk[:300] + ("..." if len(contextualized_chunk) > 300 else ""))
             
             # Verifica se precisa de limpeza
             needs_cleaning = text_cleaner.looks_like_markdown_or_html(contextualized_chunk)
-            print(f"🔍 Precisa de limpeza estrutural? {'✅ SIM' if needs_cleaning else '❌ NÃO (apenas normalização)'}")
+            emit(f"🔍 Precisa de limpeza estrutural? {'✅ SIM' if needs_cleaning else '❌ NÃO (apenas normalização)'}")
             
             # Aplica limpeza condicional
             clean_content = text_cleaner.clean_contextual_chunk(contextualized_chunk)
             
             if not clean_content:
-                print(f"   ⚠️ Chunk {i+1} vazio após limpeza, pulando.")
+                emit(f"   ⚠️ Chunk {i+1} vazio após limpeza, pulando.")
                 continue
 
             # Mostra resultado da limpeza
-            print(f"\n📦 DEPOIS da limpeza (chunk {i+1}) — len={len(clean_content)}:")
-            print(clean_content[:300] + ("..." if len(clean_content) > 300 else ""))
+            emit(f"\n📦 DEPOIS da limpeza (chunk {i+1}) — len={len(clean_content)}:")
+            emit(clean_content[:300] + ("..." if len(clean_content) > 300 else ""))
 
             # Input para embedding
             embedding_input = f"{title}\n\n{clean_content}"
-            print(f"\n🧠 INPUT para embedding (título + conteúdo limpo) — len={len(embedding_input)}:")
-            print(embedding_input[:400] + ("..." if len(embedding_input) > 400 else ""))
-
-            # Gerar embedding
-            print(f"\n🧠 Gerando embedding para chunk {i+1}...")
-            embedding = components["embedding_generator"].generate(embedding_input)
-            if not embedding:
-                print(f"   ❌ Falha ao gerar embedding para chunk {i+1}")
-                continue
-
-            print(f"   ✅ Embedding gerado: {len(embedding)} dimensões")
+            emit(f"\n🧠 INPUT para embedding (título + conteúdo limpo) — len={len(embedding_input)}:")
+            emit(embedding_input[:400] + ("..." if len(embedding_input) > 400 else ""))
 
-            print(f"\n📋 CONTEÚDO FINAL OTIMIZADO (chunk {i+1}):")
-            print("=" * 70)
-            print(clean_content)
-            print("=" * 70)
-
-            # Documento simulado (sem salvar)
+            # Documento simulado (sem salvar); embedding gerado em lote abaixo
             document = {
                 "title": title,
                 "content": clean_content,
                 "category": category,
                 "language": lang,
-                "embedding": f"[EMBEDDING COM {len(embedding)} DIMENSÕES]",
+                "embedding": None,
                 "meta_data": {
                     "source_type": "intercom_article",
                     "article_id": str(article_id),
@@ -204,66 +264,98 @@ def process_single_article_test(article: dict, components: dict, rag_collection_
                     "cleaned_conditionally": needs_cleaning
                 }
             }
-            documents_for_db.append(document)
+            pending.append((document, embedding_input))
+
+    if not pending:
+        return documents_for_db
+
+    # ✅ ETAPA 6: Embeddings de todos os chunks do artigo em uma única chamada
+    emit(f"\n🧠 ETAPA 6: Gerando embeddings em lote para {len(pending)} chunks...")
+    embeddings = components.embedding_generator.generate_batch([text for _, text in pending])
+
+    for (document, _), embedding in zip(pending, embeddings):
+        chunk_number = document["meta_data"]["chunk_index"] + 1
+        if not embedding:
+            emit(f"   ❌ Falha ao gerar embedding para chunk {chunk_number} ({document['language']})")
+            continue
 
-        print(f"\n✅ Artigo {article_id} processado com sucesso!")
-        print("=" * 80)
+        emit(f"   ✅ Embedding gerado para chunk {chunk_number} ({document['language']}): {len(embedding)} dimensões")
+
+        emit(f"\n📋 CONTEÚDO FINAL OTIMIZADO (chunk {chunk_number}):")
+        emit("=" * 70)
+        emit(document["content"])
+        emit("=" * 70)
+
+        document["embedding"] = f"[EMBEDDING COM {len(embedding)} DIMENSÕES]"
+        documents_for_db.append(document)
+
+    emit(f"\n✅ Artigo {article_id} processado com sucesso!")
+    emit("=" * 80)
 
     return documents_for_db
 
 
 def main():
     """
-    Versão de teste para processar apenas 3 artigos seguindo as melhores práticas.
+    Versão de teste para processar apenas TEST_ARTICLE_COUNT artigos seguindo as melhores práticas.
     Mostra todo o pipeline em ação sem salvar no MongoDB.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[logging.StreamHandler(sys.stdout)])
+
     try:
         Config.validate()
     except ValueError as e:
-        print(f"❌ Erro de configuração: {e}")
+        logger.error("❌ Erro de configuração: %s", e)
         return
 
-    # ✅ Inicializar componentes incluindo o novo TextCleaner
-    components = {
-        "intercom_client": IntercomClient(),
-        "text_processor": TextProcessor(),           # Agora preserva markdown
-        "chunker": LLMChunker(),
-        "enricher": ContextualEnricher(),
-        "categorizer": ArticleCategorizer(),
-        "embedding_generator": EmbeddingGenerator(),
-        "text_cleaner": TextCleaner()               # ✅ Novo componente unificado
-    }
-
-    print("🧪 MODO TESTE - Processando apenas 3 artigos (SEM salvar no MongoDB)")
-    print("📋 Pipeline: HTML → Markdown → Categorizar → Chunking → Enriquecimento → Limpeza → Embeddings")
-    print("=" * 80)
+    # ✅ Componentes (incluindo o novo TextCleaner) criados sob demanda
+    components = PipelineComponents()
+
+    logger.info("🧪 MODO TESTE - Processando apenas %s artigos (SEM salvar no MongoDB)", TEST_ARTICLE_COUNT)
+    logger.info("📋 Pipeline: HTML → Markdown → Categorizar → Chunking → Enriquecimento → Limpeza → Embeddings")
+    logger.info("=" * 80)
 
     # Configuração
     RAG_COLLECTION_ID = None  # Ajuste se quiser filtrar por coleção específica
-    EXCLUDED_ARTICLE_IDS = ["7861154"]  # Exemplo de exclusão
-
-    # Busca primeiros 3 artigos
-    print("🔍 Buscando primeiros 3 artigos...")
-    intercom_data = components["intercom_client"].fetch_articles(page_number=1, per_page=3)
+    EXCLUDED_ARTICLE_IDS = frozenset({"7861154"})  # Exemplo de exclusão
 
-    if not intercom_data or "data" not in intercom_data:
-        print("⚠️ Nenhum artigo encontrado.")
-        return
-
-    print(f"📊 Artigos encontrados para teste: {len(intercom_data['data'])}")
+    # Busca os primeiros artigos; cada um entra no pool assim que chega, e as
+    # páginas seguintes (se houver) são buscadas enquanto os primeiros processam
+    logger.info("🔍 Buscando primeiros %s artigos...", TEST_ARTICLE_COUNT)
+    article_stream = components.intercom_client.iter_articles(
+        per_page=min(TEST_ARTICLE_COUNT, Config.INTERCOM_PAGE_SIZE)
+    )
 
     all_processed_documents = []
     processed_count = 0
     skipped_count = 0
 
-    for i, article in enumerate(intercom_data["data"]):
-        print(f"\n🎯 PROCESSANDO ARTIGO {i+1}/3")
-        processed_docs = process_single_article_test(
+    def process_article(i: int, article: dict) -> list:
+        logger.info("\n🎯 PROCESSANDO ARTIGO %s/%s (ID: %s)", i+1, TEST_ARTICLE_COUNT, article.get('id'))
+        return process_single_article_test(
             article, 
             components, 
             RAG_COLLECTION_ID, 
             EXCLUDED_ARTICLE_IDS
         )
+
+    # Artigos processados em paralelo (chamadas à OpenAI limitadas pelo
+    # semáforo compartilhado); os resultados são lidos na ordem dos artigos
+    with ThreadPoolExecutor(max_workers=max(1, min(Config.ARTICLE_WORKERS, TEST_ARTICLE_COUNT))) as executor:
+        futures = [
+            executor.submit(process_article, i, article)
+            for i, article in enumerate(islice(article_stream, TEST_ARTICLE_COUNT))
+        ]
+        article_stream.close()
+
+        if not futures:
+            logger.warning("⚠️ Nenhum artigo encontrado.")
+            return
+
+        logger.info("📊 Artigos encontrados para teste: %s", len(futures))
+        results = [future.result() for future in futures]
+
+    for processed_docs in results:
         if processed_docs:
             all_processed_documents.extend(processed_docs)
             processed_count += 1
@@ -271,27 +363,27 @@ def main():
             skipped_count += 1
 
     # Relatório final
-    print(f"\n📈 RESUMO DO TESTE")
-    print("-" * 80)
-    print(f" • Artigos processados: {processed_count}")
-    print(f" • Artigos pulados: {skipped_count}")
-    print(f" • Total de documentos gerados: {len(all_processed_documents)}")
-    print(f" • MongoDB: NÃO UTILIZADO (modo teste)")
+    logger.info("\n📈 RESUMO DO TESTE")
+    logger.info("-" * 80)
+    logger.info(" • Artigos processados: %s", processed_count)
+    logger.info(" • Artigos pulados: %s", skipped_count)
+    logger.info(" • Total de documentos gerados: %s", len(all_processed_documents))
+    logger.info(" • MongoDB: NÃO UTILIZADO (modo teste)")
 
     if all_processed_documents:
-        print("\n📋 EXEMPLO DE DOCUMENTO FINAL (campos principais):")
+        logger.info("\n📋 EXEMPLO DE DOCUMENTO FINAL (campos principais):")
         example_doc = all_processed_documents[0]
-        print(f"   Título: {example_doc['title']}")
-        print(f"   Categoria: {example_doc['category']}")
-        print(f"   Idioma: {example_doc['language']}")
-        print(f"   Tamanho do conteúdo: {len(example_doc['content'])} chars")
-
-    print("\n🎉 Teste concluído! Pipeline seguiu as melhores práticas:")
-    print("   ✅ HTML convertido para markdown formatado")
-    print("   ✅ Markdown preservado durante categorização e chunking")
-    print("   ✅ Contextual enrichment trabalhou com markdown")
-    print("   ✅ Limpeza condicional aplicada apenas para embeddings")
-    print("   ✅ Conteúdo final otimizado para busca vetorial")
+        logger.info("   Título: %s", example_doc['title'])
+        logger.info("   Categoria: %s", example_doc['category'])
+        logger.info("   Idioma: %s", example_doc['language'])
+        logger.info("   Tamanho do conteúdo: %s chars", len(example_doc['content']))
+
+    logger.info("\n🎉 Teste concluído! Pipeline seguiu as melhores práticas:")
+    logger.info("   ✅ HTML convertido para markdown formatado")
+    logger.info("   ✅ Markdown preservado durante categorização e chunking")
+    logger.info("   ✅ Contextual enrichment trabalhou com markdown")
+    logger.info("   ✅ Limpeza condicional aplicada apenas para embeddings")
+    logger.info("   ✅ Conteúdo final otimizado para busca vetorial")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,50 @@
+import unittest
+
+from src.processing.text_processor import TextProcessor
+from src.utils.text_cleaner import TextCleaner
+
+
+class CleanForEmbeddingsTest(unittest.TestCase):
+    """Regressões da limpeza estrutural: as passadas seguem a ordem original."""
+
+    def setUp(self):
+        self.cleaner = TextCleaner()
+
+    def test_bullet_with_bold_and_underscore_italic(self):
+        self.assertEqual(
+            self.cleaner.clean_for_embeddings("* **Step 1**: do _this_ thing"),
+            "- Step 1: do this thing",
+        )
+
+    def test_bold_italic_leaves_no_asterisks(self):
+        self.assertEqual(self.cleaner.clean_for_embeddings("***bold italic***"), "bold italic")
+
+    def test_heading_marker_followed_by_asterisk(self):
+        self.assertEqual(self.cleaner.clean_for_embeddings("#*"), "")
+
+    def test_control_chars_are_removed_not_turned_into_line_breaks(self):
+        self.assertEqual(self.cleaner.clean_for_embeddings("(\x0c:"), "(:")
+
+    def test_control_char_does_not_split_line_into_learning_heading(self):
+        self.assertEqual(
+            self.cleaner.clean_for_embeddings("d\n)\x0bWhat you will learn"),
+            "d\n)What you will learn",
+        )
+
+
+class EmojiStrippingTest(unittest.TestCase):
+    """Só emojis são removidos: acentos, símbolos matemáticos e CJK permanecem."""
+
+    TEXT = "ação 𝑥 ∈ ℝ 𠀀 😀"
+
+    def test_clean_for_embeddings_keeps_non_emoji_characters(self):
+        self.assertEqual(TextCleaner().clean_for_embeddings(self.TEXT), "ação 𝑥 ∈ ℝ 𠀀")
+
+    def test_visual_noise_removal_keeps_non_emoji_characters(self):
+        # Sem __init__: a limpeza não usa o ImageProcessor (nem o cliente OpenAI)
+        processor = TextProcessor.__new__(TextProcessor)
+        self.assertEqual(processor._clean_visual_noise_only(self.TEXT), "ação 𝑥 ∈ ℝ 𠀀 ")
+
+
+if __name__ == "__main__":
+    unittest.main()